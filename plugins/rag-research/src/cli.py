@@ -13,15 +13,19 @@ load_dotenv()
 
 from .rag_manager import RAGManager
 from .document_loader import DocumentLoader
+from .watcher import DirectoryWatcher
+from .jobs import IngestJob
+from .federation import federated_search, federated_expand_context
+from .packing import pack_results
 
 
-def get_manager(project_dir: str = None) -> RAGManager:
+def get_manager(project_dir: str = None, db_path: str = None) -> RAGManager:
     """Get configured RAG manager instance with project-local database.
 
-    Priority: RAG_RESEARCH_DB_PATH env var > project_dir/.rag-research > ~/.rag-research
+    Priority: db_path argument > RAG_RESEARCH_DB_PATH env var > project_dir/.rag-research > ~/.rag-research
     """
     # Check for explicit env var first
-    db_path = os.getenv("RAG_RESEARCH_DB_PATH")
+    db_path = db_path or os.getenv("RAG_RESEARCH_DB_PATH")
 
     # If no env var and project_dir provided, use project-local database
     if not db_path and project_dir:
@@ -30,13 +34,55 @@ def get_manager(project_dir: str = None) -> RAGManager:
     model = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
     chunk_size = int(os.getenv("CHUNK_SIZE", "512"))
     chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "50"))
+    shards = int(os.getenv("RAG_RESEARCH_SHARDS", "1"))
 
-    return RAGManager(
-        db_path=db_path,
-        embedding_model=model,
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-    )
+    try:
+        manager = RAGManager(
+            db_path=db_path,
+            embedding_model=model,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            shards=shards,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if manager.requested_model != manager.embedding_model_name:
+        print(
+            f"Note: EMBEDDING_MODEL is {manager.requested_model} but this database uses "
+            f"{manager.embedding_model_name}. Run 'rag-research migrate --to "
+            f"{manager.requested_model}' to switch.",
+            file=sys.stderr,
+        )
+
+    return manager
+
+
+def resolve_stores(spec: str, project_dir: str = None) -> dict[str, str]:
+    """Resolve a comma-separated store list into store names and database paths.
+
+    Entries are "project" (<project-dir>/.rag-research), "global" (~/.rag-research),
+    "name=path", or a plain database path.
+    """
+    stores = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        if "=" in item:
+            name, path = item.split("=", 1)
+        elif item == "project":
+            name, path = item, str(Path(project_dir or os.getcwd()) / ".rag-research")
+        elif item == "global":
+            name, path = item, str(Path.home() / ".rag-research")
+        else:
+            name, path = item, item
+
+        stores[name.strip()] = str(Path(path.strip()).expanduser())
+
+    return stores
 
 
 def cmd_list(args):
@@ -71,63 +117,92 @@ def cmd_list(args):
 
 
 def cmd_add(args):
-    """Add a document to the index."""
-    file_path = args.file
+    """Add documents to the index through a resumable ingestion job."""
+    # Validate files
+    for file_path in args.file:
+        if not Path(file_path).exists():
+            print(f"Error: File not found: {file_path}")
+            sys.exit(1)
+
+        if not (DocumentLoader.is_supported(file_path) or DocumentLoader.is_archive(file_path)):
+            print(f"Error: Unsupported file type: {Path(file_path).suffix}")
+            print(f"Supported types: {', '.join(DocumentLoader.SUPPORTED_EXTENSIONS)}")
+            print(f"Supported archives: {', '.join(DocumentLoader.ARCHIVE_EXTENSIONS)}")
+            sys.exit(1)
 
-    # Validate file
-    if not Path(file_path).exists():
-        print(f"Error: File not found: {file_path}")
-        sys.exit(1)
+    manager = get_manager(args.project_dir)
+    job = IngestJob.create(
+        manager,
+        files=args.file,
+        title=args.title,
+        use_mistral_ocr=not args.no_ocr,
+    )
+    run_job(manager, job)
 
-    if not DocumentLoader.is_supported(file_path):
-        print(f"Error: Unsupported file type: {Path(file_path).suffix}")
-        print(f"Supported types: {', '.join(DocumentLoader.SUPPORTED_EXTENSIONS)}")
-        sys.exit(1)
 
-    print(f"Processing: {file_path}")
+def run_job(manager: RAGManager, job: IngestJob):
+    """Run an ingestion job and report each file."""
+    def report(entry):
+        if entry["error"]:
+            print(f"  Failed ({entry['state']}): {entry['source_path']}: {entry['error']}")
+        elif entry["state"] == IngestJob.SKIPPED:
+            print(f"  Skipped: {entry['source_path']}: {entry['skipped']}")
+        else:
+            print(f"  Indexed: [{entry['doc_id']}] {entry['title']} ({entry['total_chunks']} chunks)")
+
+    print(f"Processing {len(job.journal['files'])} file(s) (job {job.job_id})")
 
-    # Load document
-    loader = DocumentLoader(use_mistral_ocr=not args.no_ocr)
     try:
-        text, file_type = loader.load(file_path)
-    except Exception as e:
-        print(f"Error loading document: {e}")
+        counts = job.run(progress_callback=report)
+    except KeyboardInterrupt:
+        print(f"\nIngestion interrupted. Resume with: rag-research jobs resume {job.job_id}")
         sys.exit(1)
 
-    if not text.strip():
-        print("Error: Document appears to be empty")
+    stats = manager.get_stats()
+
+    print("\n" + "=" * 60)
+    print(f"Indexed {counts.get(IngestJob.COMMITTED, 0)} of {len(job.journal['files'])} file(s)")
+    print("=" * 60)
+    if counts.get(IngestJob.SKIPPED):
+        print(f"  Skipped files:   {counts[IngestJob.SKIPPED]}")
+    print(f"  Total documents: {stats['total_documents']}")
+    print(f"  Total chunks:    {stats['total_chunks']}")
+    print("=" * 60)
+
+    if counts["failed"]:
+        print(f"\n{counts['failed']} file(s) failed. Resume with: rag-research jobs resume {job.job_id}")
         sys.exit(1)
 
-    # Get title
-    title = args.title or loader.get_title_from_file(file_path)
 
-    # Add to index
+def cmd_jobs(args):
+    """List, resume or discard unfinished ingestion jobs."""
     manager = get_manager(args.project_dir)
-    try:
-        doc_id = manager.add_document(
-            text=text,
-            source_path=str(Path(file_path).resolve()),
-            title=title,
-            file_type=file_type,
-        )
-    except Exception as e:
-        print(f"Error indexing document: {e}")
-        sys.exit(1)
+    jobs = IngestJob.list_jobs(manager)
 
-    # Get document info
-    docs = manager.list_documents()
-    doc_info = next((d for d in docs if d["doc_id"] == doc_id), None)
+    if args.action == "list":
+        if not jobs:
+            print("No unfinished ingestion jobs.")
+            return
 
-    print("\n" + "=" * 60)
-    print("Document indexed successfully!")
-    print("=" * 60)
-    print(f"  ID:          {doc_id}")
-    print(f"  Title:       {title}")
-    print(f"  Type:        {file_type}")
-    print(f"  Words:       {doc_info['word_count'] if doc_info else 'N/A'}")
-    print(f"  Chunks:      {doc_info['total_chunks'] if doc_info else 'N/A'}")
-    print(f"  Source:      {file_path}")
-    print("=" * 60)
+        for job in jobs:
+            counts = job.counts()
+            states = ", ".join(f"{state}: {count}" for state, count in counts.items() if count)
+            print(f"{job.job_id}  {len(job.journal['files'])} file(s)  ({states})")
+        return
+
+    if args.job_id:
+        job = IngestJob(manager, args.job_id)
+    elif jobs:
+        job = jobs[-1]
+    else:
+        print("No unfinished ingestion jobs.")
+        return
+
+    if args.action == "discard":
+        job.discard()
+        print(f"Job {job.job_id} discarded.")
+    else:
+        run_job(manager, job)
 
 
 def cmd_remove(args):
@@ -149,22 +224,62 @@ def cmd_research(args):
         print("Error: Please provide a search query")
         sys.exit(1)
 
+    if args.two_stage and (args.docs or args.per_doc):
+        print("Error: --two-stage cannot be combined with --docs or --per-doc")
+        sys.exit(1)
+
+    if args.mmr is not None and not (args.docs or args.per_doc):
+        print("Error: --mmr requires --docs or --per-doc")
+        sys.exit(1)
+
+    if args.stores:
+        cmd_research_stores(args, query)
+        return
+
     manager = get_manager(args.project_dir)
     stats = manager.get_stats()
 
     if stats["total_documents"] == 0:
+        if args.pack:
+            print_packed(query, [], manager, args)
+            return
         print("No documents indexed yet.")
         print("Use '/rag-research:add-doc <file>' to add documents first.")
         return
 
-    print(f"\nSearching for: \"{query}\"")
-    print(f"Searching across {stats['total_documents']} documents ({stats['total_chunks']} chunks)...\n")
+    if not args.pack:
+        print(f"\nSearching for: \"{query}\"")
+        print(f"Searching across {stats['total_documents']} documents ({stats['total_chunks']} chunks)...\n")
 
     # Perform search
-    results = manager.search(
-        query=query,
-        limit=args.limit,
-    )
+    if args.per_doc or args.docs:
+        groups = manager.search_groups(
+            query=query,
+            docs=args.docs or 5,
+            per_doc=args.per_doc or 3,
+            mmr=args.mmr,
+        )
+        results = [hit for group in groups for hit in group.hits]
+    elif args.two_stage:
+        if not manager.has_document_vectors:
+            print("Building document vectors for two-stage search (one-time)...", file=sys.stderr)
+            manager.build_document_vectors(
+                progress_callback=lambda scanned, total: print(f"  {scanned}/{total} chunks scanned", file=sys.stderr),
+            )
+        results = manager.search_two_stage(
+            query=query,
+            limit=args.limit,
+            top_docs=args.two_stage,
+        )
+    else:
+        results = manager.search(
+            query=query,
+            limit=args.limit,
+        )
+
+    if args.pack:
+        print_packed(query, results, manager, args)
+        return
 
     if not results:
         print("No relevant results found.")
@@ -173,6 +288,88 @@ def cmd_research(args):
         print("  - Adding more documents with /rag-research:add-doc")
         return
 
+    if args.context > 0:
+        print_context_passages(query, results, manager.expand_context(results, args.context), args.json)
+        return
+
+    print_results(query, results, args.json)
+
+
+def cmd_research_stores(args, query):
+    """Search several databases in parallel and print merged results."""
+    if args.two_stage or args.docs or args.per_doc:
+        print("Error: --stores cannot be combined with --two-stage, --docs or --per-doc")
+        sys.exit(1)
+
+    managers = {}
+    for name, db_path in resolve_stores(args.stores, args.project_dir).items():
+        if not Path(db_path).is_dir():
+            print(f"Skipping store '{name}': no database at {db_path}", file=sys.stderr)
+            continue
+        managers[name] = get_manager(args.project_dir, db_path=db_path)
+
+    total_documents = sum(m.get_stats()["total_documents"] for m in managers.values())
+    total_chunks = sum(m.get_stats()["total_chunks"] for m in managers.values())
+
+    if total_documents == 0:
+        if args.pack and managers:
+            print_packed(query, [], next(iter(managers.values())), args)
+            return
+        print("No documents indexed yet.")
+        print("Use '/rag-research:add-doc <file>' to add documents first.")
+        return
+
+    if not args.pack:
+        print(f"\nSearching for: \"{query}\"")
+        print(
+            f"Searching across {len(managers)} stores ({', '.join(managers)}): "
+            f"{total_documents} documents ({total_chunks} chunks)...\n"
+        )
+
+    results = federated_search(managers, query, limit=args.limit)
+
+    if args.pack:
+        # Token counts and overlap trimming use the first store's model and chunking
+        print_packed(query, results, next(iter(managers.values())), args)
+        return
+
+    if not results:
+        print("No relevant results found.")
+        return
+
+    if args.context > 0:
+        passages = federated_expand_context(managers, results, args.context)
+        print_context_passages(query, results, passages, args.json)
+        return
+
+    print_results(query, results, args.json)
+
+
+def print_packed(query, results, manager: RAGManager, args):
+    """Print only compact JSON or NDJSON passages that fit the token budget."""
+    passages = pack_results(
+        results,
+        max_tokens=args.max_tokens,
+        count_tokens=manager.count_tokens,
+        join_chunks=manager.join_chunks,
+    )
+
+    if args.format == "ndjson":
+        for passage in passages:
+            print(json.dumps(passage, separators=(",", ":")))
+        return
+
+    output = {
+        "query": query,
+        "max_tokens": args.max_tokens,
+        "tokens": sum(p["tokens"] for p in passages),
+        "results": passages,
+    }
+    print(json.dumps(output, separators=(",", ":")))
+
+
+def print_results(query, results, as_json: bool = False):
+    """Print search results grouped by document."""
     # Group results by document
     docs_results = {}
     for result in results:
@@ -180,6 +377,7 @@ def cmd_research(args):
             docs_results[result.doc_id] = {
                 "title": result.title,
                 "source": result.source_path,
+                "store": result.store,
                 "chunks": [],
             }
         docs_results[result.doc_id]["chunks"].append(result)
@@ -192,6 +390,8 @@ def cmd_research(args):
     for doc_id, doc_data in docs_results.items():
         print(f"\n## [{doc_id}] {doc_data['title']}")
         print(f"   Source: {doc_data['source']}")
+        if doc_data["store"]:
+            print(f"   Store: {doc_data['store']}")
         print("-" * 80)
 
         for chunk in doc_data["chunks"]:
@@ -200,7 +400,8 @@ def cmd_research(args):
             if len(text) > 500:
                 text = text[:500] + "..."
 
-            print(f"\n   [Score: {chunk.score:.3f}] Chunk {chunk.chunk_index}:")
+            location = f" ({chunk.json_pointer})" if chunk.json_pointer else ""
+            print(f"\n   [Score: {chunk.score:.3f}] Chunk {chunk.chunk_index}{location}:")
             # Indent the text
             indented = "\n".join(f"   {line}" for line in text.split("\n"))
             print(indented)
@@ -208,7 +409,7 @@ def cmd_research(args):
     print("\n" + "=" * 100)
 
     # Output as JSON for Claude to process
-    if args.json:
+    if as_json:
         output = {
             "query": query,
             "total_results": len(results),
@@ -220,6 +421,8 @@ def cmd_research(args):
                     "source": r.source_path,
                     "chunk_index": r.chunk_index,
                     "score": r.score,
+                    "store": r.store,
+                    "json_pointer": r.json_pointer,
                     "text": r.chunk_text,
                 }
                 for r in results
@@ -229,6 +432,115 @@ def cmd_research(args):
         print(json.dumps(output, indent=2))
 
 
+def print_context_passages(query, results, passages, as_json: bool = False):
+    """Print contiguous passages built from search hits and their neighbors."""
+    doc_ids = {p.doc_id for p in passages}
+
+    print("=" * 100)
+    print(
+        f"Found {len(results)} relevant chunks, expanded into "
+        f"{len(passages)} passages across {len(doc_ids)} documents"
+    )
+    print("=" * 100)
+
+    for passage in passages:
+        print(f"\n## [{passage.doc_id}] {passage.title}")
+        print(f"   Source: {passage.source_path}")
+        if passage.store:
+            print(f"   Store: {passage.store}")
+        print("-" * 80)
+
+        # Truncate long passages for display
+        text = passage.text
+        if len(text) > 1500:
+            text = text[:1500] + "..."
+
+        print(f"\n   [Score: {passage.score:.3f}] Chunks {passage.start_chunk}-{passage.end_chunk}:")
+        indented = "\n".join(f"   {line}" for line in text.split("\n"))
+        print(indented)
+
+    print("\n" + "=" * 100)
+
+    if as_json:
+        output = {
+            "query": query,
+            "total_results": len(results),
+            "documents": len(doc_ids),
+            "passages": [
+                {
+                    "doc_id": p.doc_id,
+                    "title": p.title,
+                    "source": p.source_path,
+                    "start_chunk": p.start_chunk,
+                    "end_chunk": p.end_chunk,
+                    "score": p.score,
+                    "store": p.store,
+                    "text": p.text,
+                }
+                for p in passages
+            ],
+        }
+        print("\n--- JSON OUTPUT ---")
+        print(json.dumps(output, indent=2))
+
+
+def cmd_watch(args):
+    """Watch a directory and keep the index in sync with it."""
+    if not Path(args.directory).is_dir():
+        print(f"Error: Directory not found: {args.directory}")
+        sys.exit(1)
+
+    watcher = DirectoryWatcher(
+        manager=get_manager(args.project_dir),
+        loader=DocumentLoader(use_mistral_ocr=not args.no_ocr),
+        directory=args.directory,
+        debounce=args.debounce,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        force_polling=args.poll,
+    )
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def cmd_migrate(args):
+    """Re-embed the database with another embedding model."""
+    manager = get_manager(args.project_dir)
+
+    if args.cancel:
+        if manager.cancel_migration():
+            print("Migration cancelled.")
+        else:
+            print("No migration in progress.")
+        return
+
+    stats = manager.get_stats()
+    if stats["migration"]:
+        print(f"Resuming migration to {args.to} ({stats['migration']['migrated']} chunks done)...")
+    else:
+        print(f"Migrating {stats['total_chunks']} chunks from {stats['embedding_model']} to {args.to}...")
+    print("Searches keep using the current model until the migration completes.")
+
+    def report(migrated, total):
+        print(f"  {migrated}/{total} chunks re-embedded")
+
+    try:
+        manager.migrate(
+            to_model=args.to,
+            batch_size=args.batch_size,
+            keep_old=args.keep_old,
+            progress_callback=report,
+        )
+    except KeyboardInterrupt:
+        print("\nMigration paused. Run the same command again to resume.")
+        return
+
+    print(f"\nMigration complete. Database now uses {args.to}.")
+
+
 def cmd_stats(args):
     """Show database statistics."""
     manager = get_manager(args.project_dir)
@@ -241,6 +553,14 @@ def cmd_stats(args):
     print(f"  Total Chunks:     {stats['total_chunks']}")
     print(f"  Database Path:    {stats['db_path']}")
     print(f"  Embedding Model:  {stats['embedding_model']}")
+    print(f"  Collection:       {stats['collection']}")
+    print(f"  Shards:           {stats['shards']}")
+    if stats["migration"]:
+        migration = stats["migration"]
+        print(
+            f"  Migration:        to {migration['to_model']} "
+            f"({migration['migrated']}/{stats['total_chunks']} chunks)"
+        )
     print("=" * 50)
 
 
@@ -254,8 +574,14 @@ Examples:
   rag-research list                    # List all indexed documents
   rag-research list --filter mistral   # Filter by keyword
   rag-research add --file doc.pdf      # Add a document
+  rag-research add --file a.md b.pdf   # Add several documents in one job
+  rag-research add --file docs.zip     # Add every document inside an archive
+  rag-research jobs resume             # Resume an interrupted ingestion
   rag-research research machine learning  # Search for a topic
+  rag-research research tokens --context 2  # Include surrounding chunks
   rag-research remove --id abc123      # Remove a document
+  rag-research watch ./docs            # Keep the index in sync with a directory
+  rag-research migrate --to BAAI/bge-base-en-v1.5  # Switch embedding model
   rag-research stats                   # Show statistics
         """,
     )
@@ -274,9 +600,9 @@ Examples:
     list_parser.add_argument("--filter", "-f", help="Filter by title or path")
 
     # Add command
-    add_parser = subparsers.add_parser("add", help="Add a document to the index")
-    add_parser.add_argument("--file", "-f", required=True, help="Path to document file")
-    add_parser.add_argument("--title", "-t", help="Custom document title")
+    add_parser = subparsers.add_parser("add", help="Add documents to the index")
+    add_parser.add_argument("--file", "-f", required=True, nargs="+", help="Path(s) to document files")
+    add_parser.add_argument("--title", "-t", help="Custom document title (single file only)")
     add_parser.add_argument(
         "--no-ocr",
         action="store_true",
@@ -287,11 +613,111 @@ Examples:
     remove_parser = subparsers.add_parser("remove", help="Remove a document")
     remove_parser.add_argument("--id", required=True, help="Document ID to remove")
 
+    # Jobs command
+    jobs_parser = subparsers.add_parser("jobs", help="Manage unfinished ingestion jobs")
+    jobs_parser.add_argument("action", choices=["list", "resume", "discard"], help="Job action")
+    jobs_parser.add_argument("job_id", nargs="?", help="Job ID (default: most recent job)")
+
     # Research command
     research_parser = subparsers.add_parser("research", help="Search documents for a topic")
     research_parser.add_argument("query", nargs="+", help="Search query")
     research_parser.add_argument("--limit", "-l", type=int, default=10, help="Max results (default: 10)")
     research_parser.add_argument("--json", "-j", action="store_true", help="Output results as JSON")
+    research_parser.add_argument(
+        "--context", "-c",
+        type=int,
+        default=0,
+        help="Include N neighbor chunks on each side of every hit, merged into contiguous passages (default: 0)",
+    )
+    research_parser.add_argument(
+        "--two-stage",
+        type=int,
+        nargs="?",
+        const=20,
+        default=None,
+        metavar="D",
+        help="Rank documents first, then search chunks within the top D documents (default D: 20)",
+    )
+    research_parser.add_argument(
+        "--docs",
+        type=int,
+        default=None,
+        metavar="D",
+        help="Group results by document and return the best D documents (default: 5)",
+    )
+    research_parser.add_argument(
+        "--per-doc",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Group results by document with up to K chunks each (default: 3)",
+    )
+    research_parser.add_argument(
+        "--mmr",
+        type=float,
+        nargs="?",
+        const=0.5,
+        default=None,
+        metavar="LAMBDA",
+        help="With --docs/--per-doc, pick diverse chunks per document by MMR (relevance weight, default: 0.5)",
+    )
+    research_parser.add_argument(
+        "--stores",
+        default=os.getenv("RAG_RESEARCH_STORES"),
+        help="Search several databases in parallel: comma-separated 'project', 'global', "
+             "'name=path' or paths (default: RAG_RESEARCH_STORES env var)",
+    )
+    research_parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Print only compact passages packed into a token budget (for agents)",
+    )
+    research_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=2000,
+        help="Token budget for --pack (default: 2000)",
+    )
+    research_parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="Output format for --pack (default: json)",
+    )
+
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", help="Watch a directory and index changes incrementally")
+    watch_parser.add_argument("directory", help="Directory to watch recursively")
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Seconds to wait for events to settle before indexing (default: 2.0)",
+    )
+    watch_parser.add_argument("--batch-size", type=int, default=16, help="Max files per batch (default: 16)")
+    watch_parser.add_argument("--workers", type=int, default=4, help="Max files loaded concurrently (default: 4)")
+    watch_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Use polling instead of filesystem events (watchdog)",
+    )
+    watch_parser.add_argument(
+        "--no-ocr",
+        action="store_true",
+        help="Disable Mistral OCR for PDFs (use pypdf instead)",
+    )
+
+    # Migrate command
+    migrate_parser = subparsers.add_parser("migrate", help="Re-embed the database with another model")
+    migrate_group = migrate_parser.add_mutually_exclusive_group(required=True)
+    migrate_group.add_argument("--to", help="FastEmbed model to migrate to")
+    migrate_group.add_argument("--cancel", action="store_true", help="Cancel an in-progress migration")
+    migrate_parser.add_argument("--batch-size", type=int, default=64, help="Chunks per batch (default: 64)")
+    migrate_parser.add_argument(
+        "--keep-old",
+        action="store_true",
+        help="Keep the previous model's collection after switching",
+    )
 
     # Stats command
     subparsers.add_parser("stats", help="Show database statistics")
@@ -309,6 +735,9 @@ Examples:
         "remove": cmd_remove,
         "research": cmd_research,
         "stats": cmd_stats,
+        "watch": cmd_watch,
+        "migrate": cmd_migrate,
+        "jobs": cmd_jobs,
     }
 
     try:
@@ -1,9 +1,14 @@
 """Document Loader - Extract text from various file formats."""
 
+import io
 import os
+import json
 import base64
+import tarfile
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Callable, Iterator, Optional, TextIO
 
 from dotenv import load_dotenv
 
@@ -13,7 +18,15 @@ load_dotenv()
 class DocumentLoader:
     """Load and extract text from various document formats."""
 
-    SUPPORTED_EXTENSIONS = {".pdf", ".md", ".txt", ".markdown", ".rst", ".json"}
+    SUPPORTED_EXTENSIONS = {".pdf", ".md", ".txt", ".markdown", ".rst", ".json", ".jsonl"}
+    STRUCTURED_EXTENSIONS = {".json", ".jsonl"}
+    ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+    # Separator between an archive path and a member path in source paths
+    ARCHIVE_SEPARATOR = "!/"
+
+    # Characters read per step when streaming JSON files
+    STREAM_BLOCK_SIZE = 64 * 1024
 
     def __init__(self, use_mistral_ocr: bool = True):
         """
@@ -40,7 +53,8 @@ class DocumentLoader:
         Load document and extract text.
 
         Args:
-            file_path: Path to document file
+            file_path: Path to document file, or archive member as
+                "archive.zip!/inner/path.md"
 
         Returns:
             Tuple of (extracted_text, file_type)
@@ -49,12 +63,48 @@ class DocumentLoader:
             ValueError: If file type is not supported
             FileNotFoundError: If file doesn't exist
         """
+        if self.ARCHIVE_SEPARATOR in str(file_path):
+            archive_path, member_name = str(file_path).split(self.ARCHIVE_SEPARATOR, 1)
+            return self.load_bytes(self._read_archive_member(archive_path, member_name), member_name)
+
         path = Path(file_path).resolve()
 
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        ext = path.suffix.lower()
+        self._check_supported(path.name)
+        return self.load_bytes(path.read_bytes(), path.name)
+
+    def load_bytes(self, data: bytes, name: str) -> tuple[str, str]:
+        """
+        Extract text from in-memory file content.
+
+        Args:
+            data: Raw file content
+            name: File name, used to pick the loader by extension
+
+        Returns:
+            Tuple of (extracted_text, file_type)
+
+        Raises:
+            ValueError: If file type is not supported
+        """
+        ext = self._check_supported(name)
+
+        if ext == ".pdf":
+            text = self._load_pdf(data)
+        elif ext in {".md", ".markdown", ".txt", ".rst"}:
+            text = self._load_text(data)
+        elif ext in self.STRUCTURED_EXTENSIONS:
+            text = "\n\n".join(record for _, record in self._iter_records(io.BytesIO(data), ext))
+        else:
+            text = self._load_text(data)
+
+        return text, ext.lstrip(".")
+
+    def _check_supported(self, name: str) -> str:
+        """Return the lowercase extension of a file name, or raise if unsupported."""
+        ext = Path(name).suffix.lower()
 
         if ext not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(
@@ -62,28 +112,251 @@ class DocumentLoader:
                 f"Supported: {', '.join(self.SUPPORTED_EXTENSIONS)}"
             )
 
-        if ext == ".pdf":
-            text = self._load_pdf(path)
-        elif ext in {".md", ".markdown", ".txt", ".rst"}:
-            text = self._load_text(path)
-        elif ext == ".json":
-            text = self._load_json(path)
-        else:
-            text = self._load_text(path)
+        return ext
 
-        return text, ext.lstrip(".")
+    def load_records(self, file_path: str) -> Iterator[tuple[str, str]]:
+        """
+        Stream the records of a JSON or JSONL document.
 
-    def _load_text(self, path: Path) -> str:
-        """Load plain text file."""
-        return path.read_text(encoding="utf-8", errors="ignore")
+        The file is decoded incrementally, one record at a time: the lines of
+        a JSONL file, the elements of a top-level array, or the members of a
+        top-level object (arrays directly under it are streamed element by
+        element). Each record is flattened to compact "key.path: value" lines.
+
+        Args:
+            file_path: Path to document file, or archive member as
+                "archive.zip!/inner/data.json"
 
-    def _load_json(self, path: Path) -> str:
-        """Load JSON file as formatted text."""
-        import json
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return json.dumps(data, indent=2)
+        Yields:
+            Tuples of (json_pointer, flattened_text), where json_pointer
+            locates the record in the document (the line index for JSONL)
 
-    def _load_pdf(self, path: Path) -> str:
+        Raises:
+            ValueError: If the file is not JSON or JSONL, or is malformed
+            FileNotFoundError: If file doesn't exist
+        """
+        if self.ARCHIVE_SEPARATOR in str(file_path):
+            archive_path, member_name = str(file_path).split(self.ARCHIVE_SEPARATOR, 1)
+            ext = self._check_structured(member_name)
+            with self._open_archive_member(archive_path, member_name) as stream:
+                yield from self._iter_records(stream, ext)
+            return
+
+        path = Path(file_path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        ext = self._check_structured(path.name)
+
+        with open(path, "rb") as stream:
+            yield from self._iter_records(stream, ext)
+
+    def _check_structured(self, name: str) -> str:
+        """Return the extension of a JSON or JSONL file name, or raise."""
+        ext = self._check_supported(name)
+        if ext not in self.STRUCTURED_EXTENSIONS:
+            raise ValueError(f"Not a JSON or JSONL file: {name}")
+        return ext
+
+    def iter_archive(
+        self,
+        file_path: str,
+        skip: Optional[set[str]] = None,
+        defer_structured: bool = False,
+    ) -> Iterator[tuple[str, Optional[str], Optional[str], Optional[Exception]]]:
+        """
+        Stream supported documents out of a zip or tar archive.
+
+        Members are read one at a time straight from the archive (tar files
+        in streaming mode), so nothing is extracted to disk. Skipped and
+        deferred members are never read.
+
+        Args:
+            file_path: Path to archive file
+            skip: Optional source paths of members to skip without loading
+            defer_structured: Yield JSON and JSONL members without loading
+                them (text is None), to be streamed later with load_records
+
+        Yields:
+            Tuples of (source_path, extracted_text, file_type, error), where
+            source_path looks like "/abs/archive.zip!/inner/path.md" and error
+            is set instead of text when a member fails to load
+        """
+        path = Path(file_path).resolve()
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        for member_name, open_member in self._iter_archive_members(path):
+            source_path = f"{path}{self.ARCHIVE_SEPARATOR}{member_name}"
+            if skip and source_path in skip:
+                continue
+
+            if defer_structured and self.is_structured(member_name):
+                yield source_path, None, Path(member_name).suffix.lower().lstrip("."), None
+                continue
+
+            try:
+                with open_member() as member:
+                    data = member.read()
+                text, file_type = self.load_bytes(data, member_name)
+            except Exception as e:
+                yield source_path, None, None, e
+                continue
+            yield source_path, text, file_type, None
+
+    def _iter_archive_members(self, path: Path) -> Iterator[tuple[str, Callable[[], BinaryIO]]]:
+        """Yield (member_name, open_member) for supported regular files in an archive.
+
+        open_member returns a file object for the member; tar members can only
+        be opened before the iteration moves on to the next member.
+        """
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and self.is_supported(info.filename):
+                        yield info.filename, lambda info=info: archive.open(info)
+            return
+
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and self.is_supported(member.name):
+                    yield member.name, lambda member=member: archive.extractfile(member)
+
+    @contextmanager
+    def _open_archive_member(self, archive_path: str, member_name: str) -> Iterator[BinaryIO]:
+        """Open a single member of a zip or tar archive for streaming reads."""
+        path = Path(archive_path)
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {archive_path}")
+
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive, archive.open(member_name) as member:
+                yield member
+            return
+
+        with tarfile.open(path, mode="r:*") as archive:
+            member = archive.extractfile(member_name)
+            if member is None:
+                raise FileNotFoundError(f"Not a file in archive: {member_name}")
+            with member:
+                yield member
+
+    def _read_archive_member(self, archive_path: str, member_name: str) -> bytes:
+        """Read a single member from a zip or tar archive."""
+        with self._open_archive_member(archive_path, member_name) as member:
+            return member.read()
+
+    def _load_text(self, data: bytes) -> str:
+        """Load plain text content."""
+        return data.decode("utf-8", errors="ignore")
+
+    def _iter_records(self, stream: BinaryIO, ext: str) -> Iterator[tuple[str, str]]:
+        """Yield (json_pointer, flattened_text) for each non-empty record in a stream."""
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore")
+
+        if ext == ".jsonl":
+            records = (
+                (f"/{line_number}", json.loads(line))
+                for line_number, line in enumerate(text_stream)
+                if line.strip()
+            )
+        else:
+            records = self._iter_json_records(_JSONStream(text_stream, self.STREAM_BLOCK_SIZE))
+
+        for pointer, value in records:
+            text = "\n".join(self._flatten(value))
+            if text.strip():
+                yield pointer, text
+
+    def _iter_json_records(self, reader: "_JSONStream") -> Iterator[tuple[str, object]]:
+        """Yield (json_pointer, value) records from the top level of a JSON document."""
+        start = reader.peek()
+
+        if start == "[":
+            yield from self._iter_json_array(reader, "")
+        elif start == "{":
+            reader.expect("{")
+            if reader.peek() == "}":
+                reader.expect("}")
+            else:
+                yield from self._iter_json_members(reader)
+        else:
+            yield "", reader.value()
+
+        if reader.peek():
+            raise ValueError("Invalid JSON: unexpected data after the root value")
+
+    def _iter_json_members(self, reader: "_JSONStream") -> Iterator[tuple[str, object]]:
+        """Yield (json_pointer, record) for the members of the root object, through its closing brace."""
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON: object keys must be strings")
+            reader.expect(":")
+
+            pointer = "/" + key.replace("~", "~0").replace("/", "~1")
+            if reader.peek() == "[":
+                yield from self._iter_json_array(reader, pointer, key)
+            else:
+                yield pointer, {key: reader.value()}
+
+            if reader.next_char("}"):
+                return
+
+    def _iter_json_array(
+        self,
+        reader: "_JSONStream",
+        pointer: str,
+        key: Optional[str] = None,
+    ) -> Iterator[tuple[str, object]]:
+        """Yield (json_pointer, element) for each element of the array at the reader position."""
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.expect("]")
+            return
+
+        index = 0
+        while True:
+            element = reader.value()
+            # Scalars keep the key of the array they belong to
+            if key is not None and not isinstance(element, (dict, list)):
+                element = {key: element}
+
+            yield f"{pointer}/{index}", element
+            index += 1
+
+            if reader.next_char("]"):
+                return
+
+    def _flatten(self, value, prefix: str = "") -> list[str]:
+        """Flatten a JSON value into "key.path: value" lines, skipping empty values."""
+        if isinstance(value, dict):
+            lines = []
+            for key, item in value.items():
+                lines.extend(self._flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+            return lines
+
+        if isinstance(value, list):
+            # Lists of scalars stay on one line
+            if not any(isinstance(item, (dict, list)) for item in value):
+                items = [line for item in value for line in self._flatten(item)]
+                if not items:
+                    return []
+                return [f"{prefix}: {', '.join(items)}" if prefix else ", ".join(items)]
+
+            lines = []
+            for i, item in enumerate(value):
+                lines.extend(self._flatten(item, f"{prefix}[{i}]"))
+            return lines
+
+        if value is None or value == "":
+            return []
+
+        text = json.dumps(value) if isinstance(value, bool) else str(value)
+        return [f"{prefix}: {text}" if prefix else text]
+
+    def _load_pdf(self, data: bytes) -> str:
         """
         Load PDF file using Mistral OCR or pypdf fallback.
 
@@ -93,18 +366,17 @@ class DocumentLoader:
         # Try Mistral OCR first if available
         if self.use_mistral_ocr and self.mistral_client:
             try:
-                return self._load_pdf_mistral(path)
+                return self._load_pdf_mistral(data)
             except Exception as e:
                 print(f"Mistral OCR failed, falling back to pypdf: {e}")
 
         # Fallback to pypdf
-        return self._load_pdf_pypdf(path)
+        return self._load_pdf_pypdf(data)
 
-    def _load_pdf_mistral(self, path: Path) -> str:
+    def _load_pdf_mistral(self, data: bytes) -> str:
         """Load PDF using Mistral AI OCR API."""
-        # Read and encode PDF
-        pdf_bytes = path.read_bytes()
-        base64_pdf = base64.standard_b64encode(pdf_bytes).decode("utf-8")
+        # Encode PDF
+        base64_pdf = base64.standard_b64encode(data).decode("utf-8")
 
         # Call Mistral OCR
         response = self.mistral_client.ocr.process(
@@ -122,11 +394,11 @@ class DocumentLoader:
 
         return "\n\n---\n\n".join(pages_text)
 
-    def _load_pdf_pypdf(self, path: Path) -> str:
+    def _load_pdf_pypdf(self, data: bytes) -> str:
         """Load PDF using pypdf library."""
         from pypdf import PdfReader
 
-        reader = PdfReader(path)
+        reader = PdfReader(io.BytesIO(data))
         pages_text = []
 
         for i, page in enumerate(reader.pages):
@@ -137,8 +409,8 @@ class DocumentLoader:
         return "\n\n".join(pages_text)
 
     def get_title_from_file(self, file_path: str) -> str:
-        """Extract a title from filename."""
-        path = Path(file_path)
+        """Extract a title from filename (or archive member name)."""
+        path = Path(str(file_path).split(self.ARCHIVE_SEPARATOR)[-1])
         # Remove extension and clean up
         name = path.stem
         # Replace common separators with spaces
@@ -151,3 +423,94 @@ class DocumentLoader:
         """Check if file type is supported."""
         ext = Path(file_path).suffix.lower()
         return ext in cls.SUPPORTED_EXTENSIONS
+
+    @classmethod
+    def is_structured(cls, file_path: str) -> bool:
+        """Check if file is JSON or JSONL, loaded as records."""
+        ext = Path(file_path).suffix.lower()
+        return ext in cls.STRUCTURED_EXTENSIONS
+
+    @classmethod
+    def is_archive(cls, file_path: str) -> bool:
+        """Check if file is a supported archive."""
+        return str(file_path).lower().endswith(cls.ARCHIVE_EXTENSIONS)
+
+
+class _JSONStream:
+    """Decode a JSON document from a text stream one value at a time.
+
+    Only the undecoded tail of the stream is buffered, so memory use is bounded
+    by the largest single value rather than by the document size.
+    """
+
+    WHITESPACE = " \t\r\n"
+    NUMBER_CHARS = "0123456789+-.eE"
+
+    def __init__(self, stream: TextIO, block_size: int):
+        self.stream = stream
+        self.block_size = block_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Drop the consumed buffer prefix and read more input."""
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            return False
+
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.block_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def next_char(self, end: str) -> bool:
+        """Consume a "," (returning False) or the closing end character (returning True)."""
+        if self.peek() == end:
+            self.pos += 1
+            return True
+        self.expect(",")
+        return False
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"Invalid JSON: {e}") from e
+                # Read geometrically more so a large value is re-parsed only a few times
+                self._fill(max(self.block_size, len(self.buffer)))
+                continue
+
+            # A number cut by the end of the buffer (e.g. "12." of "12.75") decodes
+            # as a shorter number, so read on until a non-number character follows
+            if not self.eof and not self.buffer[end:].lstrip(self.NUMBER_CHARS):
+                self._fill(self.block_size)
+                continue
+
+            self.pos = end
+            return value
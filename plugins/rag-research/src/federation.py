@@ -0,0 +1,90 @@
+"""Federated Search - Search several RAG databases as one."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .rag_manager import ContextPassage, RAGManager, SearchResult
+
+
+def federated_search(
+    managers: dict[str, RAGManager],
+    query: str,
+    limit: int = 10,
+) -> list[SearchResult]:
+    """
+    Search several databases in parallel and merge the results.
+
+    The query is embedded once per embedding model, and every database is
+    searched in its own thread. Cosine scores from the same model are
+    directly comparable; when the databases use different models, scores
+    are min-max normalized per model before merging.
+
+    Args:
+        managers: Mapping of store name to RAG manager
+        query: Search query
+        limit: Maximum number of merged results
+
+    Returns:
+        List of SearchResult objects tagged with their store name
+    """
+    # Group stores by embedding model so each model embeds the query once
+    stores_by_model: dict[str, list[str]] = {}
+    for name, manager in managers.items():
+        stores_by_model.setdefault(manager.embedding_model_name, []).append(name)
+
+    query_embeddings = {
+        model: managers[names[0]].embed([query])[0]
+        for model, names in stores_by_model.items()
+    }
+
+    def search_store(name: str) -> list[SearchResult]:
+        manager = managers[name]
+        results = manager.search_vector(query_embeddings[manager.embedding_model_name], limit)
+        for result in results:
+            result.store = name
+        return results
+
+    with ThreadPoolExecutor(max_workers=len(managers)) as executor:
+        store_results = dict(zip(managers, executor.map(search_store, managers)))
+
+    if len(stores_by_model) > 1:
+        for names in stores_by_model.values():
+            _normalize_scores([r for name in names for r in store_results[name]])
+
+    # Merge, keeping the best hit for chunks indexed in several stores
+    merged: dict[tuple[str, int], SearchResult] = {}
+    for results in store_results.values():
+        for result in results:
+            key = (result.source_path, result.chunk_index)
+            if key not in merged or result.score > merged[key].score:
+                merged[key] = result
+
+    return sorted(merged.values(), key=lambda r: r.score, reverse=True)[:limit]
+
+
+def federated_expand_context(
+    managers: dict[str, RAGManager],
+    results: list[SearchResult],
+    window: int = 1,
+) -> list[ContextPassage]:
+    """Expand federated search hits with neighbor chunks from their own store."""
+    passages = []
+    for name, manager in managers.items():
+        store_passages = manager.expand_context([r for r in results if r.store == name], window)
+        for passage in store_passages:
+            passage.store = name
+        passages.extend(store_passages)
+
+    passages.sort(key=lambda p: p.score, reverse=True)
+    return passages
+
+
+def _normalize_scores(results: list[SearchResult]) -> None:
+    """Rescale scores to [0, 1] in place using min-max normalization."""
+    if not results:
+        return
+
+    low = min(r.score for r in results)
+    high = max(r.score for r in results)
+
+    for result in results:
+        result.score = (result.score - low) / (high - low) if high > low else 1.0
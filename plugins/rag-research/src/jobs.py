@@ -0,0 +1,548 @@
+"""Ingestion Jobs - Checkpointed, resumable document ingestion."""
+
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .document_loader import DocumentLoader
+from .rag_manager import RAGManager
+
+
+class IngestJob:
+    """Ingest files through a journal that records each completed stage.
+
+    Every file moves through the stages loaded, chunked, embedded, upserted
+    and committed. The journal and the intermediate text, chunks and vectors
+    are persisted under <db_path>/jobs/<job_id>/, so a crashed or interrupted
+    job resumes from the last completed stage of each file. Stage changes
+    are appended to a log of file states, which is folded back into the
+    journal when the job is opened, so checkpoints cost the same however
+    many files the job holds. Records, chunks and vectors are written and
+    read as JSON lines, one item at a time.
+
+    Archives are expanded into one entry per supported member, streamed
+    straight from the archive. JSON and JSONL files are streamed to disk as
+    records and chunked along record boundaries. Files are processed in
+    windows: the chunks of a window are embedded together in batches, and
+    each database shard upserts its documents in its own writer thread.
+    """
+
+    JOBS_DIR = "jobs"
+    JOURNAL_FILE = "job.json"
+    LOG_FILE = "job.log"
+
+    # Files processed per window, and chunks per embedding call
+    WINDOW_SIZE = 32
+    EMBED_BATCH_SIZE = 256
+
+    PENDING = "pending"
+    LOADED = "loaded"
+    CHUNKED = "chunked"
+    EMBEDDED = "embedded"
+    UPSERTED = "upserted"
+    COMMITTED = "committed"
+    SKIPPED = "skipped"  # Nothing to index (e.g. an empty file); never retried
+
+    def __init__(self, manager: RAGManager, job_id: str):
+        """
+        Open an existing ingestion job.
+
+        Args:
+            manager: RAG manager to index documents into
+            job_id: Job ID (directory name under <db_path>/jobs)
+
+        Raises:
+            FileNotFoundError: If the job does not exist
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.job_dir = self.jobs_dir(manager) / job_id
+        self.journal_path = self.job_dir / self.JOURNAL_FILE
+        self.log_path = self.job_dir / self.LOG_FILE
+
+        if not self.journal_path.exists():
+            raise FileNotFoundError(f"Job not found: {job_id}")
+
+        self.journal: dict = json.loads(self.journal_path.read_text())
+        self._lock = threading.Lock()
+
+        if self.log_path.exists():
+            self._replay_log()
+
+    @classmethod
+    def jobs_dir(cls, manager: RAGManager) -> Path:
+        """Get the directory holding ingestion job journals."""
+        return manager.db_path / cls.JOBS_DIR
+
+    @classmethod
+    def create(
+        cls,
+        manager: RAGManager,
+        files: list[str],
+        title: Optional[str] = None,
+        use_mistral_ocr: bool = True,
+    ) -> "IngestJob":
+        """
+        Create a new ingestion job for a list of files.
+
+        Args:
+            manager: RAG manager to index documents into
+            files: Paths of the files to ingest
+            title: Custom title (only applied when ingesting a single file)
+            use_mistral_ocr: Whether to use Mistral API for PDF OCR
+
+        Returns:
+            The created IngestJob
+        """
+        job_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        job_dir = cls.jobs_dir(manager) / job_id
+        job_dir.mkdir(parents=True)
+
+        entries = []
+        seen = set()
+        for file_path in files:
+            source_path = str(Path(file_path).resolve())
+            if source_path in seen:
+                continue
+            seen.add(source_path)
+            entries.append({
+                "source_path": source_path,
+                "doc_id": manager.doc_id_for(source_path),
+                "title": title if len(files) == 1 and not DocumentLoader.is_archive(file_path) else None,
+                "archive": DocumentLoader.is_archive(file_path),
+                "state": cls.PENDING,
+                "error": None,
+            })
+
+        journal = {
+            "job_id": job_id,
+            "created": datetime.now().isoformat(),
+            "use_mistral_ocr": use_mistral_ocr,
+            "files": entries,
+        }
+        (job_dir / cls.JOURNAL_FILE).write_text(json.dumps(journal))
+
+        return cls(manager, job_id)
+
+    @classmethod
+    def list_jobs(cls, manager: RAGManager) -> list["IngestJob"]:
+        """List unfinished ingestion jobs, oldest first."""
+        jobs_dir = cls.jobs_dir(manager)
+        if not jobs_dir.exists():
+            return []
+
+        return [
+            cls(manager, path.parent.name)
+            for path in sorted(jobs_dir.glob(f"*/{cls.JOURNAL_FILE}"))
+        ]
+
+    def _save(self, *entries: dict) -> None:
+        """Append the current state of files to the journal log."""
+        with self._lock, open(self.log_path, "a") as f:
+            f.writelines(json.dumps({"entry": entry}) + "\n" for entry in entries)
+
+    def _save_removal(self, entry: dict) -> None:
+        """Append the removal of a file from the job to the journal log."""
+        with self._lock, open(self.log_path, "a") as f:
+            f.write(json.dumps({"remove": entry["doc_id"]}) + "\n")
+
+    def _replay_log(self) -> None:
+        """Fold the journal log into the journal and write it back as one file.
+
+        Replaying is idempotent, so a crash between writing the journal and
+        deleting the log loses nothing.
+        """
+        files = self.journal["files"]
+        by_doc_id = {entry["doc_id"]: entry for entry in files}
+
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn final line from a crash mid-write
+
+                if "remove" in change:
+                    removed = by_doc_id.pop(change["remove"], None)
+                    if removed is not None:
+                        files.remove(removed)
+                    continue
+
+                entry = change["entry"]
+                if entry["doc_id"] in by_doc_id:
+                    by_doc_id[entry["doc_id"]].update(entry)
+                else:
+                    by_doc_id[entry["doc_id"]] = entry
+                    files.append(entry)
+
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.journal))
+        tmp_path.replace(self.journal_path)
+        self.log_path.unlink()
+
+    def _artifact(self, entry: dict, name: str) -> Path:
+        """Get the path of an intermediate artifact for a file."""
+        return self.job_dir / f"{entry['doc_id']}.{name}"
+
+    def _write_artifact(self, entry: dict, name: str, data) -> None:
+        """Atomically persist an intermediate artifact for a file."""
+        path = self._artifact(entry, name)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(path)
+
+    def _read_artifact(self, entry: dict, name: str):
+        """Read an intermediate artifact for a file."""
+        return json.loads(self._artifact(entry, name).read_text())
+
+    def _write_lines(self, entry: dict, name: str, rows: Iterable) -> int:
+        """Atomically persist an artifact as JSON lines, returning the number of lines."""
+        path = self._artifact(entry, name)
+        tmp_path = path.with_suffix(".tmp")
+
+        count = 0
+        with open(tmp_path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+                count += 1
+
+        tmp_path.replace(path)
+        return count
+
+    def _read_lines(self, entry: dict, name: str) -> Iterator:
+        """Stream the rows of a JSON lines artifact."""
+        with open(self._artifact(entry, name)) as f:
+            for line in f:
+                yield json.loads(line)
+
+    def counts(self) -> dict:
+        """Count files per stage, plus failed files."""
+        counts = {}
+        for entry in self.journal["files"]:
+            counts[entry["state"]] = counts.get(entry["state"], 0) + 1
+        counts["failed"] = sum(1 for entry in self.journal["files"] if entry["error"])
+        return counts
+
+    @property
+    def is_complete(self) -> bool:
+        """Check if every file has been committed or skipped."""
+        return all(entry["state"] in (self.COMMITTED, self.SKIPPED) for entry in self.journal["files"])
+
+    def _expand_archive(self, entry: dict, loader: DocumentLoader) -> None:
+        """Replace an archive entry with loaded entries for its members."""
+        known = {e["source_path"] for e in self.journal["files"]}
+
+        # Members already journaled by an interrupted expansion are skipped
+        archive_members = loader.iter_archive(entry["source_path"], skip=known, defer_structured=True)
+        for source_path, text, file_type, error in archive_members:
+            member = {
+                "source_path": source_path,
+                "doc_id": self.manager.doc_id_for(source_path),
+                "title": loader.get_title_from_file(source_path),
+                "archive": False,
+                "state": self.PENDING,
+                "error": None,
+            }
+            if error is not None:
+                member["error"] = str(error)
+            elif text is None:
+                pass  # Structured members are streamed in the load stage
+            elif not text.strip():
+                member["state"] = self.SKIPPED
+                member["skipped"] = "Document appears to be empty"
+            else:
+                self._store_loaded(member, text, file_type)
+
+            self.journal["files"].append(member)
+            self._save(member)
+
+        self.journal["files"].remove(entry)
+        self._save_removal(entry)
+
+    def _store_loaded(self, entry: dict, text: str, file_type: str) -> None:
+        """Persist extracted text and mark an entry as loaded."""
+        self._write_artifact(entry, "text.json", text)
+        entry["file_type"] = file_type
+        entry["word_count"] = len(text.split())
+        entry["state"] = self.LOADED
+
+    def _store_records(self, entry: dict, loader: DocumentLoader) -> bool:
+        """Stream the records of a JSON or JSONL file to disk, marking the entry loaded unless empty."""
+        entry["word_count"] = 0
+
+        def counted() -> Iterator[list]:
+            for pointer, text in loader.load_records(entry["source_path"]):
+                entry["word_count"] += len(text.split())
+                yield [pointer, text]
+
+        if not self._write_lines(entry, "records.jsonl", counted()):
+            return False
+
+        entry["file_type"] = Path(entry["source_path"]).suffix.lower().lstrip(".")
+        entry["state"] = self.LOADED
+        return True
+
+    def _skip(self, entry: dict, reason: str) -> None:
+        """Mark a file that has nothing to index as skipped, so the job can complete."""
+        entry["state"] = self.SKIPPED
+        entry["skipped"] = reason
+        self._remove_artifacts(entry)
+        self._save(entry)
+
+    def _remove_artifacts(self, entry: dict) -> None:
+        """Delete the intermediate artifacts of a file."""
+        for name in ("text.json", "records.jsonl", "chunks.jsonl", "vectors.jsonl"):
+            self._artifact(entry, name).unlink(missing_ok=True)
+
+    def _load_and_chunk(self, entry: dict, loader: DocumentLoader) -> None:
+        """Run the load and chunk stages for one file, saving after each stage."""
+        structured = loader.is_structured(entry["source_path"])
+
+        if entry["state"] == self.PENDING:
+            if structured:
+                loaded = self._store_records(entry, loader)
+            else:
+                text, file_type = loader.load(entry["source_path"])
+                loaded = bool(text.strip())
+                if loaded:
+                    self._store_loaded(entry, text, file_type)
+
+            if not loaded:
+                self._skip(entry, "Document appears to be empty")
+                return
+
+            entry["title"] = entry["title"] or loader.get_title_from_file(entry["source_path"])
+            self._save(entry)
+
+        if entry["state"] == self.LOADED:
+            if structured:
+                chunks = self.manager.chunk(records=self._read_lines(entry, "records.jsonl"))
+            else:
+                chunks = self.manager.chunk(self._read_artifact(entry, "text.json"))
+
+            # Each line holds a chunk and the JSON pointer of its first record
+            entry["total_chunks"] = self._write_lines(entry, "chunks.jsonl", ([c, p] for c, p in chunks))
+            if not entry["total_chunks"]:
+                self._skip(entry, "Document produced no chunks after processing")
+                return
+
+            entry["state"] = self.CHUNKED
+            self._save(entry)
+
+        # Vectors from another model (e.g. after a migration) must be recomputed
+        if entry["state"] == self.EMBEDDED and entry["embedding_model"] != self.manager.embedding_model_name:
+            entry["state"] = self.CHUNKED
+
+    def _embed(self, entries: list[dict]) -> None:
+        """
+        Run the embed stage for several files with batched embedding calls.
+
+        Chunks are streamed from each file's chunk artifact into shared
+        batches, and the vectors are appended to the file's vector artifact,
+        so a large file is never held in memory as a whole.
+        """
+        batch: list[tuple[dict, str]] = []
+        read: list[dict] = []  # Files whose chunks have all been batched
+
+        for entry in entries:
+            self._vectors_tmp(entry).unlink(missing_ok=True)
+
+            for chunk, _ in self._read_lines(entry, "chunks.jsonl"):
+                if entry["error"]:
+                    break
+
+                batch.append((entry, chunk))
+                if len(batch) >= self.EMBED_BATCH_SIZE:
+                    self._embed_batch(batch)
+                    batch = []
+                    self._finish_embedded(read)
+
+            read.append(entry)
+
+        if batch:
+            self._embed_batch(batch)
+        self._finish_embedded(read)
+
+    def _vectors_tmp(self, entry: dict) -> Path:
+        """Get the path of a file's partially written vector artifact."""
+        return self._artifact(entry, "vectors.jsonl").with_suffix(".tmp")
+
+    def _embed_batch(self, batch: list[tuple[dict, str]]) -> None:
+        """Embed a batch of (entry, chunk) pairs and append the vectors to each file."""
+        entries = {id(entry): entry for entry, _ in batch}
+
+        try:
+            embeddings = self.manager.embed([chunk for _, chunk in batch])
+        except Exception as e:
+            for entry in entries.values():
+                entry["error"] = str(e)
+            self._save(*entries.values())
+            return
+
+        vectors: dict[int, list] = {}
+        for (entry, _), embedding in zip(batch, embeddings):
+            vectors.setdefault(id(entry), []).append(embedding)
+
+        for key, entry_vectors in vectors.items():
+            with open(self._vectors_tmp(entries[key]), "a") as f:
+                f.writelines(json.dumps(vector) + "\n" for vector in entry_vectors)
+
+    def _finish_embedded(self, entries: list[dict]) -> None:
+        """Mark files whose vectors have all been written as embedded."""
+        for entry in entries:
+            if entry["error"]:
+                self._vectors_tmp(entry).unlink(missing_ok=True)
+                continue
+
+            self._vectors_tmp(entry).replace(self._artifact(entry, "vectors.jsonl"))
+            entry["embedding_model"] = self.manager.embedding_model_name
+            entry["date_added"] = datetime.now().isoformat()
+            entry["state"] = self.EMBEDDED
+
+        if entries:
+            self._save(*entries)
+            entries.clear()
+
+    def _upsert(self, entries: list[dict]) -> None:
+        """Run the upsert stage for several files, one writer thread per shard."""
+        by_shard: dict[int, list[dict]] = {}
+        for entry in entries:
+            by_shard.setdefault(self.manager.shard_index(entry["doc_id"]), []).append(entry)
+
+        def upsert_shard(shard_entries: list[dict]) -> None:
+            for entry in shard_entries:
+                try:
+                    self.manager.upsert_chunks(
+                        doc_id=entry["doc_id"],
+                        chunks=(chunk for chunk, _ in self._read_lines(entry, "chunks.jsonl")),
+                        embeddings=self._read_lines(entry, "vectors.jsonl"),
+                        source_path=entry["source_path"],
+                        title=entry["title"],
+                        file_type=entry["file_type"],
+                        date_added=entry["date_added"],
+                        json_pointers=(pointer for _, pointer in self._read_lines(entry, "chunks.jsonl")),
+                        total_chunks=entry["total_chunks"],
+                    )
+                except Exception as e:
+                    entry["error"] = str(e)
+                    self._save(entry)
+                    continue
+
+                entry["state"] = self.UPSERTED
+                self._save(entry)
+
+        if not by_shard:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(by_shard)) as executor:
+            list(executor.map(upsert_shard, by_shard.values()))
+
+    def _commit(self, entries: list[dict]) -> None:
+        """Run the commit stage for several files, saving the metadata once."""
+        committed = []
+        for entry in entries:
+            try:
+                self.manager.commit_document(
+                    doc_id=entry["doc_id"],
+                    total_chunks=entry["total_chunks"],
+                    source_path=entry["source_path"],
+                    title=entry["title"],
+                    file_type=entry["file_type"],
+                    date_added=entry["date_added"],
+                    word_count=entry["word_count"],
+                    save=False,
+                )
+            except Exception as e:
+                entry["error"] = str(e)
+                self._save(entry)
+                continue
+            committed.append(entry)
+
+        if not committed:
+            return
+
+        # Files stay upserted in the journal until their metadata is on disk
+        self.manager.save_metadata()
+        for entry in committed:
+            entry["state"] = self.COMMITTED
+            self._remove_artifacts(entry)
+        self._save(*committed)
+
+    def run(self, progress_callback=None) -> dict:
+        """
+        Run or resume the job until every file is committed, skipped or has failed.
+
+        A failing file is recorded in the journal and skipped; it is retried
+        from its last completed stage on the next run. The job directory is
+        removed once every file is committed.
+
+        Args:
+            progress_callback: Optional callable(entry) called after each file
+
+        Returns:
+            Dictionary with counts of files per stage, plus failed files
+        """
+        loader = DocumentLoader(use_mistral_ocr=self.journal["use_mistral_ocr"])
+
+        # Failed files are retried from their last completed stage
+        for entry in self.journal["files"]:
+            entry["error"] = None
+
+        for entry in [e for e in self.journal["files"] if e.get("archive")]:
+            try:
+                self._expand_archive(entry, loader)
+            except Exception as e:
+                entry["error"] = str(e)
+                self._save(entry)
+                if progress_callback:
+                    progress_callback(entry)
+
+        pending = [
+            e for e in self.journal["files"]
+            if e["state"] not in (self.COMMITTED, self.SKIPPED) and not e.get("archive")
+        ]
+
+        for start in range(0, len(pending), self.WINDOW_SIZE):
+            window = pending[start:start + self.WINDOW_SIZE]
+
+            for entry in window:
+                if entry["error"]:
+                    continue
+                try:
+                    self._load_and_chunk(entry, loader)
+                except Exception as e:
+                    entry["error"] = str(e)
+                    self._save(entry)
+
+            self._embed([e for e in window if e["state"] == self.CHUNKED and not e["error"]])
+            self._upsert([e for e in window if e["state"] == self.EMBEDDED and not e["error"]])
+
+            # Metadata has a single writer, so commits stay sequential
+            self._commit([e for e in window if e["state"] == self.UPSERTED and not e["error"]])
+
+            if progress_callback:
+                for entry in window:
+                    progress_callback(entry)
+
+        counts = self.counts()
+        if self.is_complete:
+            self.discard()
+        return counts
+
+    def discard(self) -> None:
+        """
+        Delete the job journal and its intermediate artifacts.
+
+        Files whose chunks were written but never committed have their
+        points deleted as well, so no points are left without metadata.
+        """
+        for entry in self.journal["files"]:
+            if entry["state"] == self.UPSERTED or (entry["state"] == self.EMBEDDED and entry["error"]):
+                # The upsert already replaced any previously indexed version
+                self.manager.remove_document(entry["doc_id"])
+
+        shutil.rmtree(self.job_dir, ignore_errors=True)
@@ -0,0 +1,77 @@
+"""Context Packing - Fit search results into a token budget for agents."""
+
+from typing import Callable
+
+from .rag_manager import SearchResult
+
+
+def pack_results(
+    results: list[SearchResult],
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+    join_chunks: Callable[[list[str]], str],
+) -> list[dict]:
+    """
+    Pack search results into a token budget.
+
+    Adjacent chunks of the same document are merged first, dropping the text
+    they share through chunk overlap. The merged passages are then added
+    greedily by score, skipping any that no longer fit the budget.
+
+    Args:
+        results: Search results to pack
+        max_tokens: Token budget for the packed passage texts
+        count_tokens: Callable returning the token count of a text
+        join_chunks: Callable joining consecutive chunk texts without overlap
+
+    Returns:
+        List of compact passage dictionaries, highest score first
+    """
+    # Collect hits per document, keeping the best score per chunk
+    by_doc: dict[tuple[str, str], dict[int, SearchResult]] = {}
+    for result in results:
+        chunks = by_doc.setdefault((result.store, result.doc_id), {})
+        if result.chunk_index not in chunks or result.score > chunks[result.chunk_index].score:
+            chunks[result.chunk_index] = result
+
+    # Merge runs of consecutive chunks into passages
+    passages = []
+    for chunks in by_doc.values():
+        run: list[SearchResult] = []
+        for index in sorted(chunks):
+            if run and index != run[-1].chunk_index + 1:
+                passages.append(_merge_run(run, join_chunks))
+                run = []
+            run.append(chunks[index])
+        passages.append(_merge_run(run, join_chunks))
+
+    passages.sort(key=lambda p: p["score"], reverse=True)
+
+    packed = []
+    used = 0
+    for passage in passages:
+        tokens = count_tokens(passage["text"])
+        if used + tokens > max_tokens:
+            continue
+        passage["tokens"] = tokens
+        packed.append(passage)
+        used += tokens
+
+    return packed
+
+
+def _merge_run(run: list[SearchResult], join_chunks: Callable[[list[str]], str]) -> dict:
+    """Merge consecutive chunks of one document into a compact passage."""
+    passage = {
+        "doc_id": run[0].doc_id,
+        "title": run[0].title,
+        "source": run[0].source_path,
+        "chunks": [run[0].chunk_index, run[-1].chunk_index],
+        "score": round(max(r.score for r in run), 4),
+        "text": join_chunks([r.chunk_text for r in run]),
+    }
+    if run[0].store:
+        passage["store"] = run[0].store
+    if run[0].json_pointer:
+        passage["json_pointer"] = run[0].json_pointer
+    return passage
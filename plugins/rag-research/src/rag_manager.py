@@ -2,11 +2,17 @@
 
 import json
 import hashlib
+import itertools
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from dataclasses import dataclass, asdict
 
+import numpy as np
 from fastembed import TextEmbedding
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -16,6 +22,12 @@ from qdrant_client.models import (
     Filter,
     FieldCondition,
     MatchValue,
+    MatchAny,
+    PointIdsList,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
 )
 
 
@@ -31,6 +43,7 @@ class DocumentMetadata:
     total_chunks: int
     word_count: int
     text: str  # Store original text for retrieval
+    json_pointer: Optional[str] = None  # First record of the chunk in JSON/JSONL documents
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -45,16 +58,56 @@ class SearchResult:
     chunk_text: str
     chunk_index: int
     score: float
+    store: str = ""  # Store name in federated searches
+    json_pointer: Optional[str] = None  # First record of the chunk in JSON/JSONL documents
 
     def __str__(self) -> str:
         return f"[{self.score:.3f}] {self.title} (chunk {self.chunk_index})"
 
 
+@dataclass
+class ContextPassage:
+    """Contiguous passage built from search hits and their neighbor chunks."""
+    doc_id: str
+    title: str
+    source_path: str
+    start_chunk: int
+    end_chunk: int
+    text: str
+    score: float
+    store: str = ""  # Store name in federated searches
+
+    def __str__(self) -> str:
+        return f"[{self.score:.3f}] {self.title} (chunks {self.start_chunk}-{self.end_chunk})"
+
+
+@dataclass
+class SearchGroup:
+    """Search results from a single document."""
+    doc_id: str
+    title: str
+    source_path: str
+    hits: list[SearchResult]
+
+    @property
+    def score(self) -> float:
+        return max(hit.score for hit in self.hits)
+
+    def __str__(self) -> str:
+        return f"[{self.score:.3f}] {self.title} ({len(self.hits)} chunks)"
+
+
 class RAGManager:
     """Manages document vectorization and semantic search using Qdrant + FastEmbed."""
 
+    # Alias pointing at the per-model collection currently serving queries.
+    # Databases created before per-model collections use it as a plain collection.
     COLLECTION_NAME = "rag_research_documents"
     METADATA_FILE = "documents_metadata.json"
+    MIGRATION_FILE = "migration.json"
+
+    # Chunks written per Qdrant upsert call
+    UPSERT_BATCH_SIZE = 256
 
     def __init__(
         self,
@@ -62,39 +115,101 @@ class RAGManager:
         embedding_model: str = "BAAI/bge-small-en-v1.5",
         chunk_size: int = 512,
         chunk_overlap: int = 50,
+        shards: int = 1,
     ):
         """
         Initialize RAG Manager.
 
         Args:
             db_path: Path to store Qdrant database (default: ~/.rag-research)
-            embedding_model: FastEmbed model name
+            embedding_model: FastEmbed model name (existing databases keep the
+                model they were built with until migrated)
             chunk_size: Number of characters per chunk
             chunk_overlap: Overlap between chunks
+            shards: Number of local Qdrant shards for a new database (existing
+                databases keep their shard count)
+
+        Raises:
+            ValueError: If shards is less than 1
         """
+        if shards < 1:
+            raise ValueError(f"Shard count must be at least 1, got {shards}")
+
         self.db_path = Path(db_path) if db_path else Path.home() / ".rag-research"
         self.db_path.mkdir(parents=True, exist_ok=True)
 
         # Ensure .gitignore is updated for project-local databases
         self._ensure_gitignore()
 
-        self.embedding_model_name = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
         # Initialize FastEmbed model
         self._embedding_model = None
-
-        # Initialize Qdrant client with local storage
-        self.client = QdrantClient(path=str(self.db_path / "qdrant_data"))
+        self._migration_model = None
+        self._tokenizer = None
 
         # Metadata storage
         self.metadata_path = self.db_path / self.METADATA_FILE
         self._documents_metadata: dict = self._load_metadata()
 
+        # The shard count is fixed when the database is created; existing
+        # databases without a recorded count predate sharding
+        is_new = not (self.db_path / "qdrant_data").exists()
+        if "shards" not in self._documents_metadata:
+            self._documents_metadata["shards"] = shards if is_new else 1
+        self.shards = self._documents_metadata["shards"]
+
+        # Initialize one Qdrant client with local storage per shard; documents
+        # are assigned to shards by doc_id hash
+        self.clients = [
+            QdrantClient(path=str(self.db_path / ("qdrant_data" if i == 0 else f"qdrant_data_{i}")))
+            for i in range(self.shards)
+        ]
+        self.client = self.clients[0]
+        self._shard_executor: Optional[ThreadPoolExecutor] = None
+
+        # Vectors must be queried with the model they were built with, so the
+        # database model wins over the requested one until migrate() is run
+        self.requested_model = embedding_model
+        self.embedding_model_name = self._documents_metadata.get("embedding_model", embedding_model)
+        if "embedding_model" not in self._documents_metadata:
+            if not is_new:
+                self._check_legacy_vector_size(embedding_model)
+            self._documents_metadata["embedding_model"] = embedding_model
+
+        # In-progress model migration checkpoint, if any
+        self.migration_path = self.db_path / self.MIGRATION_FILE
+        self._migration: Optional[dict] = self._load_migration()
+
         # Ensure collection exists
         self._ensure_collection()
 
+    def _check_legacy_vector_size(self, model_name: str) -> None:
+        """
+        Check that a database without a recorded model matches model_name.
+
+        Databases created before the model was recorded only reveal their
+        vector size, so a model producing vectors of another size is refused
+        rather than adopted.
+
+        Raises:
+            ValueError: If the stored vectors do not match the model's size
+        """
+        if not self.client.collection_exists(self.COLLECTION_NAME):
+            return
+
+        stored_size = self.client.get_collection(self.COLLECTION_NAME).config.params.vectors.size
+        model_size = self._get_vector_size(model_name)
+        if stored_size != model_size:
+            for client in self.clients:
+                client.close()
+            raise ValueError(
+                f"Database at {self.db_path} holds {stored_size}-dimensional vectors, but "
+                f"{model_name} produces {model_size}. Set EMBEDDING_MODEL to the model "
+                f"the database was built with."
+            )
+
     @property
     def embedding_model(self) -> TextEmbedding:
         """Lazy initialization of embedding model."""
@@ -102,31 +217,77 @@ class RAGManager:
             self._embedding_model = TextEmbedding(model_name=self.embedding_model_name)
         return self._embedding_model
 
-    def _get_vector_size(self) -> int:
+    @property
+    def migration_model(self) -> TextEmbedding:
+        """Lazy initialization of the migration target model."""
+        if self._migration_model is None:
+            self._migration_model = TextEmbedding(model_name=self._migration["to_model"])
+        return self._migration_model
+
+    def _get_vector_size(self, model_name: Optional[str] = None) -> int:
         """Get the embedding dimension from the model."""
-        # BGE-small-en-v1.5 has 384 dimensions
-        model_dims = {
-            "BAAI/bge-small-en-v1.5": 384,
-            "BAAI/bge-base-en-v1.5": 768,
-            "BAAI/bge-large-en-v1.5": 1024,
-        }
-        return model_dims.get(self.embedding_model_name, 384)
+        model_name = model_name or self.embedding_model_name
+
+        for description in TextEmbedding.list_supported_models():
+            if description["model"] == model_name:
+                return description["dim"]
+
+        # Custom models: embed a probe text and measure it
+        model = self.embedding_model if model_name == self.embedding_model_name else TextEmbedding(model_name=model_name)
+        return len(self._embed_texts(["dimension probe"], model)[0])
 
-    def _embed_texts(self, texts: list[str]) -> list[list[float]]:
+    def _embed_texts(self, texts: list[str], model: Optional[TextEmbedding] = None) -> list[list[float]]:
         """Generate embeddings for texts using FastEmbed."""
-        embeddings = list(self.embedding_model.embed(texts))
+        embeddings = list((model or self.embedding_model).embed(texts))
         return [e.tolist() for e in embeddings]
 
+    def count_tokens(self, text: str) -> int:
+        """
+        Count tokens in text with the embedding model's tokenizer.
+
+        Falls back to an estimate of four characters per token when the
+        model does not expose its tokenizer.
+        """
+        if self._tokenizer is None:
+            tokenizer = getattr(getattr(self.embedding_model, "model", None), "tokenizer", None)
+            if tokenizer is None:
+                self._tokenizer = False
+            else:
+                # Copy so the embedding tokenizer keeps its truncation settings
+                from tokenizers import Tokenizer
+                self._tokenizer = Tokenizer.from_str(tokenizer.to_str())
+                self._tokenizer.no_truncation()
+                self._tokenizer.no_padding()
+
+        if self._tokenizer is False:
+            return max(1, len(text) // 4)
+
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
     def _load_metadata(self) -> dict:
         """Load documents metadata from disk."""
         if self.metadata_path.exists():
             return json.loads(self.metadata_path.read_text())
         return {"documents": {}, "stats": {"total_documents": 0, "total_chunks": 0}}
 
+    def save_metadata(self) -> None:
+        """Save documents metadata to disk, e.g. after commits with save=False."""
+        self._save_metadata()
+
     def _save_metadata(self) -> None:
         """Save documents metadata to disk."""
         self.metadata_path.write_text(json.dumps(self._documents_metadata, indent=2))
 
+    def _load_migration(self) -> Optional[dict]:
+        """Load the migration checkpoint from disk, if a migration is in progress."""
+        if self.migration_path.exists():
+            return json.loads(self.migration_path.read_text())
+        return None
+
+    def _save_migration(self) -> None:
+        """Save the migration checkpoint to disk."""
+        self.migration_path.write_text(json.dumps(self._migration, indent=2))
+
     def _ensure_gitignore(self) -> None:
         """Ensure .rag-research is in project's .gitignore for project-local databases.
 
@@ -163,22 +324,206 @@ class RAGManager:
             # Silently ignore permission errors - user can manually update .gitignore
             pass
 
+    def _collection_for_model(self, model_name: str) -> str:
+        """Get the per-model collection name for an embedding model."""
+        slug = re.sub(r"[^a-z0-9]+", "_", model_name.lower()).strip("_")
+        return f"rag_research_{slug}"
+
+    def shard_index(self, doc_id: str) -> int:
+        """Get the index of the shard that stores a document."""
+        return int(doc_id, 16) % len(self.clients)
+
+    def _shard_client(self, doc_id: str) -> QdrantClient:
+        """Get the shard client that stores a document."""
+        return self.clients[self.shard_index(doc_id)]
+
+    def _fan_out(self, fn) -> list:
+        """Run fn(client) on every shard in parallel, returning results in shard order."""
+        return self._fan_out_indexed(lambda index: fn(self.clients[index]))
+
+    def _fan_out_indexed(self, fn) -> list:
+        """Run fn(shard_index) on every shard in parallel, returning results in shard order."""
+        if len(self.clients) == 1:
+            return [fn(0)]
+
+        if self._shard_executor is None:
+            self._shard_executor = ThreadPoolExecutor(max_workers=len(self.clients))
+        return list(self._shard_executor.map(fn, range(len(self.clients))))
+
+    def _resolve_collection(self) -> str:
+        """Get the collection currently behind the COLLECTION_NAME alias."""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == self.COLLECTION_NAME:
+                return alias.collection_name
+        # Legacy database with a plain collection
+        return self.COLLECTION_NAME
+
+    def _create_collection(self, collection_name: str, model_name: str) -> None:
+        """Create a vector collection sized for an embedding model on every shard."""
+        vector_size = self._get_vector_size(model_name)
+
+        for client in self.clients:
+            client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(
+                    size=vector_size,
+                    distance=Distance.COSINE,
+                ),
+            )
+
+    def _delete_collection(self, collection_name: str) -> None:
+        """Delete a collection from every shard, if present."""
+        for client in self.clients:
+            if client.collection_exists(collection_name):
+                client.delete_collection(collection_name)
+
+    def _update_aliases(self, operations: list) -> None:
+        """Apply the same alias operations on every shard."""
+        for client in self.clients:
+            client.update_collection_aliases(change_aliases_operations=operations)
+
+    def _document_collection(self, collection_name: Optional[str] = None) -> str:
+        """Get the document-level vector collection paired with a chunk collection."""
+        return f"{collection_name or self._resolve_collection()}_docs"
+
     def _ensure_collection(self) -> None:
-        """Ensure the vector collection exists."""
-        collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
+        """Ensure the vector collections and the collection alias exist."""
+        # A legacy plain collection is deleted before its name becomes an
+        # alias; a switch interrupted in between is finished, not replaced by
+        # an empty collection
+        if (
+            self._migration
+            and self._migration["from_collection"] == self.COLLECTION_NAME
+            and not self.client.collection_exists(self.COLLECTION_NAME)
+        ):
+            self._switch_collection()
+
+        # Alias, or plain collection in legacy databases
+        if not self.client.collection_exists(self.COLLECTION_NAME):
+            collection_name = self._collection_for_model(self.embedding_model_name)
+            if not self.client.collection_exists(collection_name):
+                self._create_collection(collection_name, self.embedding_model_name)
+
+            self._update_aliases([
+                CreateAliasOperation(
+                    create_alias=CreateAlias(
+                        collection_name=collection_name,
+                        alias_name=self.COLLECTION_NAME,
+                    )
+                )
+            ])
+            self._save_metadata()
 
-        if self.COLLECTION_NAME not in collection_names:
-            vector_size = self._get_vector_size()
+        # Databases indexed before document-level vectors get them built on
+        # first use by build_document_vectors; new databases start with them
+        if not self.has_document_vectors and self._documents_metadata["stats"]["total_chunks"] == 0:
+            self._rebuild_document_vectors(self._resolve_collection())
 
-            self.client.create_collection(
-                collection_name=self.COLLECTION_NAME,
+    @property
+    def has_document_vectors(self) -> bool:
+        """Check if the document-level vectors for two-stage search exist."""
+        doc_collection = self._document_collection()
+        return all(client.collection_exists(doc_collection) for client in self.clients)
+
+    def build_document_vectors(self, progress_callback=None) -> None:
+        """
+        Build the document-level vectors of a database indexed before they existed.
+
+        Args:
+            progress_callback: Optional callable(scanned, total) called after
+                each batch of chunks
+        """
+        self._rebuild_document_vectors(self._resolve_collection(), progress_callback)
+
+    def _generate_document_point_id(self, doc_id: str) -> int:
+        """Generate numeric point ID for a document-level vector."""
+        return int(doc_id, 16)
+
+    def _rebuild_document_vectors(self, collection_name: str, progress_callback=None) -> None:
+        """
+        Recreate the document-level collection from a chunk collection.
+
+        Each document vector is the mean of its chunk vectors. All chunks of
+        a document live on one shard, so every shard is rebuilt on its own.
+
+        Args:
+            collection_name: Chunk collection to read vectors from
+            progress_callback: Optional callable(scanned, total) called after
+                each batch of chunks
+        """
+        doc_collection = self._document_collection(collection_name)
+        self._delete_collection(doc_collection)
+
+        total = sum(client.count(collection_name).count for client in self.clients)
+        scanned = 0
+        lock = threading.Lock()
+
+        def rebuild(client: QdrantClient) -> None:
+            nonlocal scanned
+
+            # Accumulate per-document vector sums in a single pass
+            sums: dict[str, np.ndarray] = {}
+            counts: dict[str, int] = {}
+            payloads: dict[str, dict] = {}
+            offset = None
+
+            while True:
+                points, offset = client.scroll(
+                    collection_name=collection_name,
+                    limit=1024,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                vectors = np.asarray([point.vector for point in points], dtype=np.float32)
+                for point, vector in zip(points, vectors):
+                    doc_id = point.payload.get("doc_id")
+                    if doc_id not in sums:
+                        sums[doc_id] = vector.copy()
+                        counts[doc_id] = 1
+                        payloads[doc_id] = self._document_payload(point.payload)
+                    else:
+                        sums[doc_id] += vector
+                        counts[doc_id] += 1
+
+                with lock:
+                    scanned += len(points)
+                    if progress_callback:
+                        progress_callback(scanned, total)
+
+                if offset is None:
+                    break
+
+            # Create the collection only once complete, so an interrupted
+            # rebuild is retried rather than leaving partial vectors
+            client.create_collection(
+                collection_name=doc_collection,
                 vectors_config=VectorParams(
-                    size=vector_size,
+                    size=client.get_collection(collection_name).config.params.vectors.size,
                     distance=Distance.COSINE,
                 ),
             )
 
+            doc_points = [
+                PointStruct(
+                    id=self._generate_document_point_id(doc_id),
+                    vector=(vector / counts[doc_id]).tolist(),
+                    payload=payloads[doc_id],
+                )
+                for doc_id, vector in sums.items()
+            ]
+            for i in range(0, len(doc_points), 256):
+                client.upsert(collection_name=doc_collection, points=doc_points[i:i + 256])
+
+        self._fan_out(rebuild)
+
+    def _document_payload(self, payload: dict) -> dict:
+        """Extract the document-level payload from a chunk payload."""
+        return {
+            key: payload.get(key)
+            for key in ("doc_id", "title", "source_path", "file_type", "date_added", "total_chunks")
+        }
+
     def _generate_doc_id(self, source_path: str) -> str:
         """Generate unique document ID from source path."""
         return hashlib.md5(source_path.encode()).hexdigest()[:12]
@@ -214,91 +559,393 @@ class RAGManager:
 
         return [c for c in chunks if c]  # Filter empty chunks
 
+    def _chunk_records(self, records: Iterable[tuple[str, str]]) -> Iterator[tuple[str, str]]:
+        """
+        Split structured records into chunks aligned to record boundaries.
+
+        Consecutive records are packed into one chunk while they fit in
+        chunk_size, and a record longer than chunk_size is split on its own.
+        Chunks never start or end in the middle of a shorter record. Records
+        are consumed as a stream, so only the current chunk is held in memory.
+
+        Args:
+            records: (json_pointer, text) pairs in document order
+
+        Yields:
+            Tuples of (chunk, json_pointer), where the pointer locates the
+            first record of the chunk
+        """
+        current: list[str] = []
+        current_pointer = ""
+        size = 0
+
+        for pointer, text in records:
+            if current and size + len(text) + 2 > self.chunk_size:
+                yield "\n\n".join(current), current_pointer
+                current = []
+
+            if len(text) > self.chunk_size:
+                for chunk in self._chunk_text(text):
+                    yield chunk, pointer
+                continue
+
+            if not current:
+                current_pointer = pointer
+                size = len(text)
+            else:
+                size += len(text) + 2
+            current.append(text)
+
+        if current:
+            yield "\n\n".join(current), current_pointer
+
+    def join_chunks(self, chunks: list[str]) -> str:
+        """Join consecutive chunks into one text, dropping the chunk overlap."""
+        if not chunks:
+            return ""
+
+        text = chunks[0]
+        # Short matches are likely coincidental rather than real overlap
+        min_overlap = min(8, self.chunk_overlap // 2) or 1
+
+        for chunk in chunks[1:]:
+            overlap = 0
+            for k in range(min(len(text), len(chunk), self.chunk_overlap), min_overlap - 1, -1):
+                if text.endswith(chunk[:k]):
+                    overlap = k
+                    break
+
+            if overlap:
+                text += chunk[overlap:]
+            else:
+                text += " " + chunk
+
+        return text
+
+    def doc_id_for(self, source_path: str) -> str:
+        """Get the document ID assigned to a source path."""
+        return self._generate_doc_id(source_path)
+
+    def chunk(
+        self,
+        text: str = "",
+        records: Optional[Iterable[tuple[str, str]]] = None,
+    ) -> Iterator[tuple[str, Optional[str]]]:
+        """
+        Split a document into chunks.
+
+        Args:
+            text: Document text content (ignored when records are given)
+            records: Optional (json_pointer, text) records of a JSON/JSONL
+                document, consumed as a stream
+
+        Returns:
+            Iterator of (chunk, json_pointer) tuples; the pointer locates the
+            chunk's first record, or is None for plain text
+        """
+        if records is not None:
+            return self._chunk_records(records)
+        return ((chunk, None) for chunk in self._chunk_text(text))
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with the database's embedding model."""
+        return self._embed_texts(texts)
+
     def add_document(
         self,
         text: str,
         source_path: str,
         title: Optional[str] = None,
         file_type: str = "unknown",
+        records: Optional[Iterable[tuple[str, str]]] = None,
     ) -> str:
         """
         Add a document to the RAG database.
 
         Args:
-            text: Document text content
+            text: Document text content (ignored when records are given)
             source_path: Original file path
             title: Document title (defaults to filename)
             file_type: File extension/type
+            records: Optional (json_pointer, text) records of a JSON/JSONL
+                document, consumed as a stream; chunks are then aligned to
+                the records
 
         Returns:
             Document ID
         """
         doc_id = self._generate_doc_id(source_path)
 
-        # Check if document already exists
-        if doc_id in self._documents_metadata["documents"]:
-            # Remove old chunks first
-            self.remove_document(doc_id)
-
         # Use filename as title if not provided
         if not title:
             title = Path(source_path).stem
 
-        # Chunk the document
-        chunks = self._chunk_text(text)
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+            # Records are spooled to disk and then streamed through chunking,
+            # embedding and upserting in batches, so large JSON exports never
+            # sit in memory and a malformed file fails before anything is
+            # replaced
+            if records is not None:
+                word_count = 0
+                for pointer, record in records:
+                    word_count += len(record.split())
+                    spool.write(json.dumps([pointer, record]) + "\n")
+                spool.seek(0)
+                chunk_stream = self.chunk(records=(tuple(json.loads(line)) for line in spool))
+            else:
+                word_count = len(text.split())
+                chunk_stream = self.chunk(text)
+
+            def embedded() -> Iterator[tuple[str, list[float], Optional[str]]]:
+                for batch in self._batched(chunk_stream, self.UPSERT_BATCH_SIZE):
+                    embeddings = self._embed_texts([chunk for chunk, _ in batch])
+                    for (chunk, pointer), embedding in zip(batch, embeddings):
+                        yield chunk, embedding, pointer
+
+            # The first batch is embedded before the previous version is deleted
+            items = embedded()
+            first = next(items, None)
+            if first is None:
+                raise ValueError("Document produced no chunks after processing")
+
+            date_added = datetime.now().isoformat()
+            try:
+                total_chunks = self._write_chunks(
+                    doc_id, itertools.chain([first], items), source_path, title, file_type, date_added
+                )
+            except Exception:
+                # The previous version may already be gone; drop partial points
+                # and its metadata so search never serves a half-written document
+                self.remove_document(doc_id)
+                raise
 
-        if not chunks:
-            raise ValueError("Document produced no chunks after processing")
+        self.commit_document(doc_id, total_chunks, source_path, title, file_type, date_added, word_count)
 
-        # Generate embeddings for all chunks
-        embeddings = self._embed_texts(chunks)
+        return doc_id
 
-        # Prepare points for Qdrant
-        points = []
-        date_added = datetime.now().isoformat()
+    def upsert_chunks(
+        self,
+        doc_id: str,
+        chunks: Iterable[str],
+        embeddings: Iterable[list[float]],
+        source_path: str,
+        title: str,
+        file_type: str,
+        date_added: str,
+        json_pointers: Optional[Iterable[Optional[str]]] = None,
+        total_chunks: Optional[int] = None,
+    ) -> int:
+        """
+        Write a document's chunk vectors, replacing any previous version.
 
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            metadata = DocumentMetadata(
-                doc_id=doc_id,
-                title=title,
-                source_path=source_path,
-                file_type=file_type,
-                date_added=date_added,
-                chunk_index=i,
-                total_chunks=len(chunks),
-                word_count=len(chunk.split()),
-                text=chunk,
-            )
+        The document's metadata is not updated until commit_document is
+        called. Only the document's shard is written, so documents on
+        different shards can be upserted concurrently. Chunks, vectors and
+        pointers are consumed as streams and written in batches.
 
-            point_id = self._generate_point_id(doc_id, i)
-            points.append(
-                PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload=metadata.to_dict(),
+        Args:
+            doc_id: Document ID
+            chunks: Chunk texts
+            embeddings: Chunk vectors from the database model
+            source_path: Original file path
+            title: Document title
+            file_type: File extension/type
+            date_added: ISO timestamp of the indexing run
+            json_pointers: Optional JSON pointer of each chunk's first record
+            total_chunks: Number of chunks, if known in advance
+
+        Returns:
+            Number of chunks written
+
+        Raises:
+            ValueError: If there are no chunks
+        """
+        if json_pointers is None:
+            json_pointers = itertools.repeat(None)
+
+        return self._write_chunks(
+            doc_id,
+            zip(chunks, embeddings, json_pointers),
+            source_path,
+            title,
+            file_type,
+            date_added,
+            total_chunks,
+        )
+
+    def _write_chunks(
+        self,
+        doc_id: str,
+        items: Iterable[tuple[str, list[float], Optional[str]]],
+        source_path: str,
+        title: str,
+        file_type: str,
+        date_added: str,
+        total_chunks: Optional[int] = None,
+    ) -> int:
+        """Write (chunk, vector, json_pointer) items in batches, replacing any previous version."""
+        items = iter(items)
+        first = next(items, None)
+        if first is None:
+            raise ValueError("Document produced no chunks after processing")
+
+        client = self._shard_client(doc_id)
+
+        # Drop the previous version, or stray points from an interrupted run
+        self._delete_document_points(doc_id)
+
+        collection_names = [self.COLLECTION_NAME]
+        if self._migration:
+            collection_names.append(self._migration["to_collection"])
+
+        count = 0
+        vector_sum = None
+        document_payload = None
+
+        for batch in self._batched(itertools.chain([first], items), self.UPSERT_BATCH_SIZE):
+            points = []
+            for chunk, embedding, json_pointer in batch:
+                metadata = DocumentMetadata(
+                    doc_id=doc_id,
+                    title=title,
+                    source_path=source_path,
+                    file_type=file_type,
+                    date_added=date_added,
+                    chunk_index=count,
+                    total_chunks=total_chunks or 0,
+                    word_count=len(chunk.split()),
+                    text=chunk,
+                    json_pointer=json_pointer,
+                )
+                points.append(
+                    PointStruct(
+                        id=self._generate_point_id(doc_id, count),
+                        vector=embedding,
+                        payload=metadata.to_dict(),
+                    )
+                )
+                count += 1
+
+            client.upsert(collection_name=self.COLLECTION_NAME, points=points)
+
+            batch_sum = np.sum([point.vector for point in points], axis=0)
+            vector_sum = batch_sum if vector_sum is None else vector_sum + batch_sum
+            document_payload = document_payload or self._document_payload(points[0].payload)
+
+            # Keep the migration target current so the switch loses nothing
+            if self._migration:
+                target_embeddings = self._embed_texts([point.payload["text"] for point in points], self.migration_model)
+                client.upsert(
+                    collection_name=self._migration["to_collection"],
+                    points=[
+                        PointStruct(id=point.id, vector=embedding, payload=point.payload)
+                        for point, embedding in zip(points, target_embeddings)
+                    ],
                 )
+
+        # Streams of unknown length get their chunk count once it is known
+        if total_chunks is None:
+            for collection_name in collection_names:
+                client.set_payload(
+                    collection_name=collection_name,
+                    payload={"total_chunks": count},
+                    points=Filter(must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))]),
+                )
+            document_payload["total_chunks"] = count
+
+        # Store the document-level vector for two-stage search; until the
+        # collection is built, build_document_vectors picks this document up
+        if self.has_document_vectors:
+            client.upsert(
+                collection_name=self._document_collection(),
+                points=[
+                    PointStruct(
+                        id=self._generate_document_point_id(doc_id),
+                        vector=(vector_sum / count).tolist(),
+                        payload=document_payload,
+                    )
+                ],
             )
 
-        # Upsert points to Qdrant
-        self.client.upsert(
-            collection_name=self.COLLECTION_NAME,
-            points=points,
-        )
+        return count
+
+    @staticmethod
+    def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+        """Split an iterable into lists of up to size items."""
+        iterator = iter(iterable)
+        while batch := list(itertools.islice(iterator, size)):
+            yield batch
+
+    def commit_document(
+        self,
+        doc_id: str,
+        total_chunks: int,
+        source_path: str,
+        title: str,
+        file_type: str,
+        date_added: str,
+        word_count: int,
+        save: bool = True,
+    ) -> None:
+        """Record an upserted document in the metadata, making it visible.
+
+        With save=False the metadata is only updated in memory, so a caller
+        committing many documents can write it once with save_metadata().
+        """
+        previous = self._documents_metadata["documents"].get(doc_id)
+        if previous:
+            self._documents_metadata["stats"]["total_documents"] -= 1
+            self._documents_metadata["stats"]["total_chunks"] -= previous["total_chunks"]
 
-        # Update metadata
         self._documents_metadata["documents"][doc_id] = {
             "title": title,
             "source_path": source_path,
             "file_type": file_type,
             "date_added": date_added,
-            "total_chunks": len(chunks),
-            "word_count": len(text.split()),
+            "total_chunks": total_chunks,
+            "word_count": word_count,
         }
         self._documents_metadata["stats"]["total_documents"] += 1
-        self._documents_metadata["stats"]["total_chunks"] += len(chunks)
-        self._save_metadata()
+        self._documents_metadata["stats"]["total_chunks"] += total_chunks
+        if save:
+            self._save_metadata()
 
-        return doc_id
+    def _delete_document_points(self, doc_id: str) -> None:
+        """Delete a document's chunk and document-level points from all collections."""
+        client = self._shard_client(doc_id)
+
+        collection_names = [self.COLLECTION_NAME]
+        if self._migration:
+            collection_names.append(self._migration["to_collection"])
+
+        # Deleting by filter scans the whole local collection, so new documents
+        # are checked by ID first; any partial write starts with chunk 0
+        if doc_id not in self._documents_metadata["documents"] and not client.retrieve(
+            collection_name=self.COLLECTION_NAME,
+            ids=[self._generate_point_id(doc_id, 0)],
+            with_payload=False,
+            with_vectors=False,
+        ):
+            collection_names = []
+
+        for collection_name in collection_names:
+            client.delete(
+                collection_name=collection_name,
+                points_selector=Filter(
+                    must=[
+                        FieldCondition(
+                            key="doc_id",
+                            match=MatchValue(value=doc_id),
+                        )
+                    ]
+                ),
+            )
+
+        if self.has_document_vectors:
+            client.delete(
+                collection_name=self._document_collection(),
+                points_selector=PointIdsList(points=[self._generate_document_point_id(doc_id)]),
+            )
 
     def remove_document(self, doc_id: str) -> bool:
         """
@@ -307,26 +954,22 @@ class RAGManager:
         Args:
             doc_id: Document ID to remove
 
+        Points left without metadata (e.g. by an interrupted ingestion) are
+        deleted as well.
+
         Returns:
             True if document was removed, False if not found
         """
         if doc_id not in self._documents_metadata["documents"]:
+            # Only well-formed IDs can have stray points
+            if re.fullmatch(r"[0-9a-f]{12}", doc_id):
+                self._delete_document_points(doc_id)
             return False
 
         doc_info = self._documents_metadata["documents"][doc_id]
 
         # Delete points from Qdrant using filter
-        self.client.delete(
-            collection_name=self.COLLECTION_NAME,
-            points_selector=Filter(
-                must=[
-                    FieldCondition(
-                        key="doc_id",
-                        match=MatchValue(value=doc_id),
-                    )
-                ]
-            ),
-        )
+        self._delete_document_points(doc_id)
 
         # Update metadata
         self._documents_metadata["stats"]["total_documents"] -= 1
@@ -381,41 +1024,427 @@ class RAGManager:
         # Generate query embedding
         query_embedding = self._embed_texts([query])[0]
 
+        return self.search_vector(query_embedding, limit, doc_ids)
+
+    def search_two_stage(
+        self,
+        query: str,
+        limit: int = 10,
+        top_docs: int = 20,
+    ) -> list[SearchResult]:
+        """
+        Search in two stages: pick the best documents, then their best chunks.
+
+        The first stage ranks document-level vectors, so chunk ranking is
+        limited to top_docs documents regardless of corpus size.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            top_docs: Number of candidate documents for the chunk stage
+
+        Returns:
+            List of SearchResult objects
+        """
+        if not self.has_document_vectors:
+            self.build_document_vectors()
+
+        query_embedding = self._embed_texts([query])[0]
+        doc_collection = self._document_collection()
+
+        responses = self._fan_out(lambda client: client.query_points(
+            collection_name=doc_collection,
+            query=query_embedding,
+            limit=top_docs,
+            with_payload=["doc_id"],
+        ))
+        doc_points = self._merge_top([r.points for r in responses], top_docs)
+        doc_ids = [point.payload["doc_id"] for point in doc_points]
+
+        if not doc_ids:
+            return []
+
+        return self.search_vector(query_embedding, limit, doc_ids)
+
+    def search_vector(
+        self,
+        query_embedding: list[float],
+        limit: int = 10,
+        doc_ids: Optional[list[str]] = None,
+    ) -> list[SearchResult]:
+        """
+        Search chunks with an already embedded query.
+
+        Args:
+            query_embedding: Query vector from the database's embedding model
+            limit: Maximum number of results
+            doc_ids: Optional list of document IDs to search within
+
+        Returns:
+            List of SearchResult objects
+        """
         # Build filter if doc_ids specified
         query_filter = None
         if doc_ids:
             query_filter = Filter(
-                should=[
+                must=[
                     FieldCondition(
                         key="doc_id",
-                        match=MatchValue(value=doc_id),
+                        match=MatchAny(any=doc_ids),
                     )
-                    for doc_id in doc_ids
                 ]
             )
 
-        # Search in Qdrant
-        response = self.client.query_points(
+        # Search every shard in Qdrant and keep the overall top results
+        responses = self._fan_out(lambda client: client.query_points(
             collection_name=self.COLLECTION_NAME,
             query=query_embedding,
             limit=limit,
             query_filter=query_filter,
             with_payload=True,
+        ))
+        points = self._merge_top([r.points for r in responses], limit)
+
+        return [self._to_search_result(point) for point in points]
+
+    def _merge_top(self, shard_items: list[list], limit: int, key=lambda item: item.score) -> list:
+        """Merge per-shard results into the overall top results."""
+        if len(shard_items) == 1:
+            return shard_items[0][:limit]
+        merged = [item for items in shard_items for item in items]
+        return sorted(merged, key=key, reverse=True)[:limit]
+
+    def _to_search_result(self, point) -> SearchResult:
+        """Convert a scored Qdrant point into a SearchResult."""
+        payload = point.payload
+        return SearchResult(
+            doc_id=payload.get("doc_id", ""),
+            title=payload.get("title", ""),
+            source_path=payload.get("source_path", ""),
+            chunk_text=payload.get("text", ""),
+            chunk_index=payload.get("chunk_index", 0),
+            score=point.score,
+            json_pointer=payload.get("json_pointer"),
         )
 
-        search_results = []
-        for result in response.points:
-            payload = result.payload
-            search_results.append(SearchResult(
-                doc_id=payload.get("doc_id", ""),
-                title=payload.get("title", ""),
-                source_path=payload.get("source_path", ""),
-                chunk_text=payload.get("text", ""),
-                chunk_index=payload.get("chunk_index", 0),
-                score=result.score,
+    def search_groups(
+        self,
+        query: str,
+        docs: int = 5,
+        per_doc: int = 3,
+        mmr: Optional[float] = None,
+    ) -> list[SearchGroup]:
+        """
+        Search for the best documents with up to per_doc chunks each.
+
+        Grouping by doc_id is done by Qdrant, so a single long document
+        cannot crowd other sources out of the results.
+
+        Args:
+            query: Search query
+            docs: Maximum number of documents
+            per_doc: Maximum number of chunks per document
+            mmr: Optional MMR relevance weight between 0 and 1; when set, each
+                document's chunks are re-selected from a larger candidate set
+                to trade relevance (1.0) against diversity (0.0)
+
+        Returns:
+            List of SearchGroup objects sorted by best chunk score
+        """
+        query_embedding = self._embed_texts([query])[0]
+
+        # Documents never span shards, so per-shard groups are complete
+        responses = self._fan_out(lambda client: client.query_points_groups(
+            collection_name=self.COLLECTION_NAME,
+            query=query_embedding,
+            group_by="doc_id",
+            limit=docs,
+            group_size=per_doc * 3 if mmr is not None else per_doc,
+            with_payload=True,
+            with_vectors=mmr is not None,
+        ))
+        shard_groups = self._merge_top(
+            [r.groups for r in responses],
+            docs,
+            key=lambda group: group.hits[0].score,
+        )
+
+        groups = []
+        for group in shard_groups:
+            points = group.hits
+            if mmr is not None:
+                points = self._select_mmr(points, per_doc, mmr)
+
+            hits = [self._to_search_result(point) for point in points]
+            groups.append(SearchGroup(
+                doc_id=hits[0].doc_id,
+                title=hits[0].title,
+                source_path=hits[0].source_path,
+                hits=hits,
+            ))
+
+        return groups
+
+    def _select_mmr(self, points: list, k: int, relevance: float) -> list:
+        """Pick k points by maximal marginal relevance using their vectors."""
+        if not points:
+            return []
+
+        vectors = np.array([point.vector for point in points], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+        similarity = vectors @ vectors.T
+        scores = np.array([point.score for point in points])
+
+        selected: list[int] = []
+        max_similarity = np.zeros(len(points))
+        available = np.ones(len(points), dtype=bool)
+
+        while len(selected) < min(k, len(points)):
+            mmr_scores = relevance * scores - (1 - relevance) * max_similarity
+            mmr_scores[~available] = -np.inf
+            best = int(np.argmax(mmr_scores))
+
+            # The first pick has nothing to be similar to
+            max_similarity = similarity[best] if not selected else np.maximum(max_similarity, similarity[best])
+            selected.append(best)
+            available[best] = False
+
+        return [points[i] for i in selected]
+
+    def expand_context(
+        self,
+        results: list[SearchResult],
+        window: int = 1,
+    ) -> list[ContextPassage]:
+        """
+        Expand search hits with their neighbor chunks into contiguous passages.
+
+        Neighbor point IDs are computed with _generate_point_id and fetched in a
+        single retrieve call, so no additional vector search is performed.
+        Overlapping or adjacent windows within a document are merged.
+
+        Args:
+            results: Search results to expand
+            window: Number of neighbor chunks to include on each side of a hit
+
+        Returns:
+            List of ContextPassage objects sorted by best hit score
+        """
+        # Compute the chunk window around every hit
+        windows: dict[str, list[tuple[int, int, float]]] = {}
+        for result in results:
+            doc_info = self._documents_metadata["documents"].get(result.doc_id, {})
+            total_chunks = doc_info.get("total_chunks", result.chunk_index + 1)
+            start = max(0, result.chunk_index - window)
+            end = min(total_chunks - 1, result.chunk_index + window)
+            windows.setdefault(result.doc_id, []).append((start, end, result.score))
+
+        # Merge overlapping or adjacent windows per document
+        spans: list[tuple[str, int, int, float]] = []
+        for doc_id, doc_windows in windows.items():
+            doc_windows.sort()
+            cur_start, cur_end, cur_score = doc_windows[0]
+            for start, end, score in doc_windows[1:]:
+                if start <= cur_end + 1:
+                    cur_end = max(cur_end, end)
+                    cur_score = max(cur_score, score)
+                else:
+                    spans.append((doc_id, cur_start, cur_end, cur_score))
+                    cur_start, cur_end, cur_score = start, end, score
+            spans.append((doc_id, cur_start, cur_end, cur_score))
+
+        if not spans:
+            return []
+
+        # Fetch all chunks of all windows in one round trip per shard
+        shard_ids: dict[int, list[int]] = {}
+        for doc_id, start, end, _ in spans:
+            shard_ids.setdefault(self.shard_index(doc_id), []).extend(
+                self._generate_point_id(doc_id, i) for i in range(start, end + 1)
+            )
+
+        def retrieve(index: int) -> list:
+            if index not in shard_ids:
+                return []
+            return self.clients[index].retrieve(
+                collection_name=self.COLLECTION_NAME,
+                ids=shard_ids[index],
+                with_payload=True,
+                with_vectors=False,
+            )
+
+        chunks = {
+            (point.payload.get("doc_id"), point.payload.get("chunk_index")): point.payload
+            for points in self._fan_out_indexed(retrieve)
+            for point in points
+        }
+
+        passages = []
+        for doc_id, start, end, score in spans:
+            payloads = [
+                chunks[(doc_id, i)] for i in range(start, end + 1)
+                if (doc_id, i) in chunks
+            ]
+            if not payloads:
+                continue
+
+            passages.append(ContextPassage(
+                doc_id=doc_id,
+                title=payloads[0].get("title", ""),
+                source_path=payloads[0].get("source_path", ""),
+                start_chunk=payloads[0].get("chunk_index", start),
+                end_chunk=payloads[-1].get("chunk_index", end),
+                text=self.join_chunks([p.get("text", "") for p in payloads]),
+                score=score,
             ))
 
-        return search_results
+        passages.sort(key=lambda p: p.score, reverse=True)
+        return passages
+
+    def migrate(
+        self,
+        to_model: str,
+        batch_size: int = 64,
+        keep_old: bool = False,
+        progress_callback=None,
+    ) -> None:
+        """
+        Re-embed all chunks with another model and switch to it.
+
+        Chunks are re-embedded from their stored text into a new per-model
+        collection. A checkpoint is saved after every batch, so an interrupted
+        migration resumes where it stopped. Queries keep using the current
+        collection until the COLLECTION_NAME alias is switched at the end.
+
+        Args:
+            to_model: FastEmbed model name to migrate to
+            batch_size: Number of chunks re-embedded per batch
+            keep_old: Keep the previous collection after switching
+            progress_callback: Optional callable(migrated, total) called after each batch
+
+        Raises:
+            ValueError: If the database already uses to_model, or a migration
+                to a different model is in progress
+        """
+        if to_model == self.embedding_model_name:
+            raise ValueError(f"Database already uses {to_model}")
+
+        if self._migration and self._migration["to_model"] != to_model:
+            raise ValueError(
+                f"A migration to {self._migration['to_model']} is in progress. "
+                "Resume it or cancel it first."
+            )
+
+        if not self._migration:
+            to_collection = self._collection_for_model(to_model)
+
+            # Drop leftovers from a cancelled migration
+            self._delete_collection(to_collection)
+            self._create_collection(to_collection, to_model)
+
+            self._migration = {
+                "from_model": self.embedding_model_name,
+                "from_collection": self._resolve_collection(),
+                "to_model": to_model,
+                "to_collection": to_collection,
+                "shard": 0,
+                "offset": None,
+                "migrated": 0,
+                "started": datetime.now().isoformat(),
+            }
+            self._save_migration()
+
+        total = self._documents_metadata["stats"]["total_chunks"]
+
+        # Shards are migrated one after another, each scrolled in batches
+        while self._migration.get("shard", 0) < len(self.clients):
+            client = self.clients[self._migration.get("shard", 0)]
+
+            points, next_offset = client.scroll(
+                collection_name=self._migration["from_collection"],
+                limit=batch_size,
+                offset=self._migration["offset"],
+                with_payload=True,
+                with_vectors=False,
+            )
+
+            if points:
+                embeddings = self._embed_texts(
+                    [point.payload.get("text", "") for point in points],
+                    self.migration_model,
+                )
+                client.upsert(
+                    collection_name=self._migration["to_collection"],
+                    points=[
+                        PointStruct(id=point.id, vector=embedding, payload=point.payload)
+                        for point, embedding in zip(points, embeddings)
+                    ],
+                )
+
+            if next_offset is None:
+                self._migration["shard"] = self._migration.get("shard", 0) + 1
+            self._migration["offset"] = next_offset
+            self._migration["migrated"] += len(points)
+            self._save_migration()
+
+            if progress_callback:
+                progress_callback(self._migration["migrated"], total)
+
+        self._rebuild_document_vectors(self._migration["to_collection"])
+        self._switch_collection(keep_old)
+
+    def _switch_collection(self, keep_old: bool = False) -> None:
+        """Point the alias at the migrated collection and finish the migration."""
+        from_collection = self._migration["from_collection"]
+        create_alias = CreateAliasOperation(
+            create_alias=CreateAlias(
+                collection_name=self._migration["to_collection"],
+                alias_name=self.COLLECTION_NAME,
+            )
+        )
+
+        if from_collection == self.COLLECTION_NAME:
+            # Legacy plain collection: it must go before its name can become an alias
+            self._delete_collection(from_collection)
+            self._delete_collection(self._document_collection(from_collection))
+            self._update_aliases([create_alias])
+        else:
+            self._update_aliases([
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=self.COLLECTION_NAME)),
+                create_alias,
+            ])
+            if not keep_old:
+                self._delete_collection(from_collection)
+                self._delete_collection(self._document_collection(from_collection))
+
+        self.embedding_model_name = self._migration["to_model"]
+        self._embedding_model = self._migration_model
+        self._documents_metadata["embedding_model"] = self.embedding_model_name
+        self._save_metadata()
+
+        self._migration = None
+        self._migration_model = None
+        self.migration_path.unlink(missing_ok=True)
+
+    def cancel_migration(self) -> bool:
+        """
+        Cancel an in-progress migration and drop its partial collection.
+
+        Returns:
+            True if a migration was cancelled, False if none was in progress
+        """
+        if not self._migration:
+            return False
+
+        to_collection = self._migration["to_collection"]
+        self._delete_collection(to_collection)
+        self._delete_collection(self._document_collection(to_collection))
+
+        self._migration = None
+        self._migration_model = None
+        self.migration_path.unlink(missing_ok=True)
+        return True
 
     def get_stats(self) -> dict:
         """Get database statistics."""
@@ -424,4 +1453,8 @@ class RAGManager:
             "total_chunks": self._documents_metadata["stats"]["total_chunks"],
             "db_path": str(self.db_path),
             "embedding_model": self.embedding_model_name,
+            "requested_model": self.requested_model,
+            "shards": self.shards,
+            "collection": self._resolve_collection(),
+            "migration": self._migration,
         }
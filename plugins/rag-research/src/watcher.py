@@ -0,0 +1,306 @@
+"""Directory Watcher - Keep the index in sync with a directory of documents."""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .document_loader import DocumentLoader
+from .rag_manager import RAGManager
+
+
+class DirectoryWatcher:
+    """Watch a directory and incrementally index changed, new and deleted files.
+
+    File events are collected from watchdog (inotify on Linux) when installed,
+    or from a periodic mtime scan otherwise. Events are debounced and processed
+    in batches, so only the files that actually changed are re-embedded.
+    """
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+    def __init__(
+        self,
+        manager: RAGManager,
+        loader: DocumentLoader,
+        directory: str,
+        debounce: float = 2.0,
+        batch_size: int = 16,
+        max_workers: int = 4,
+        poll_interval: float = 2.0,
+        force_polling: bool = False,
+    ):
+        """
+        Initialize directory watcher.
+
+        Args:
+            manager: RAG manager to index documents into
+            loader: Document loader used to extract text
+            directory: Directory to watch recursively
+            debounce: Seconds without new events before a batch is processed
+            batch_size: Maximum number of files processed per batch
+            max_workers: Maximum number of files loaded concurrently
+            poll_interval: Seconds between scans when polling
+            force_polling: Use polling even if watchdog is available
+        """
+        self.manager = manager
+        self.loader = loader
+        self.directory = Path(directory).resolve()
+        self.debounce = debounce
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.force_polling = force_polling
+
+        # Pending changes: resolved path -> action, latest event wins
+        self._pending: dict[str, str] = {}
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._snapshot: dict[str, float] = {}
+
+    def _is_relevant(self, path: Path) -> bool:
+        """Check if a path should be indexed (supported and outside the database)."""
+        if not DocumentLoader.is_supported(str(path)):
+            return False
+        return self.manager.db_path.resolve() not in path.parents
+
+    def _scan(self) -> dict[str, float]:
+        """Return modification times of all relevant files in the directory."""
+        snapshot = {}
+        for path in self.directory.rglob("*"):
+            if path.is_file() and self._is_relevant(path):
+                try:
+                    snapshot[str(path)] = path.stat().st_mtime
+                except OSError:
+                    continue
+        return snapshot
+
+    def _queue(self, path: str, action: str) -> None:
+        """Queue a file change, replacing any earlier pending action for it."""
+        if not self._is_relevant(Path(path)):
+            return
+        with self._lock:
+            self._pending[path] = action
+            self._last_event = time.monotonic()
+
+    def _queue_directory(self, directory: str, action: str) -> None:
+        """Queue every file under a directory that was created, deleted or moved.
+
+        Deleted and moved-away directories no longer exist on disk, so their
+        indexed documents are looked up by source path instead.
+        """
+        path = Path(directory)
+        if action == self.DELETE:
+            paths = [
+                doc["source_path"] for doc in self.manager.list_documents()
+                if path in Path(doc["source_path"]).parents
+            ]
+        else:
+            paths = [str(child) for child in path.rglob("*") if child.is_file()]
+
+        for file_path in paths:
+            self._queue(file_path, action)
+
+    def sync(self) -> None:
+        """Queue files that changed while the watcher was not running.
+
+        New files and files modified after they were indexed are queued for
+        indexing, and indexed files under the directory that no longer exist
+        are queued for removal.
+        """
+        self._snapshot = self._scan()
+
+        indexed = {}
+        for doc in self.manager.list_documents():
+            # Archive members are indexed through their archive, not as files
+            if DocumentLoader.ARCHIVE_SEPARATOR in doc["source_path"]:
+                continue
+
+            source = Path(doc["source_path"])
+            if source == self.directory or self.directory in source.parents:
+                indexed[str(source)] = doc
+
+        for path, mtime in self._snapshot.items():
+            doc = indexed.get(path)
+            if doc is None or datetime.fromtimestamp(mtime) > datetime.fromisoformat(doc["date_added"]):
+                self._queue(path, self.UPSERT)
+
+        for path in indexed:
+            if path not in self._snapshot:
+                self._queue(path, self.DELETE)
+
+    def _poll(self) -> None:
+        """Diff the directory against the last scan and queue changes."""
+        snapshot = self._scan()
+
+        for path, mtime in snapshot.items():
+            if self._snapshot.get(path) != mtime:
+                self._queue(path, self.UPSERT)
+
+        for path in self._snapshot:
+            if path not in snapshot:
+                self._queue(path, self.DELETE)
+
+        self._snapshot = snapshot
+
+    def _start_observer(self):
+        """Start a watchdog observer, or return None if unavailable."""
+        if self.force_polling:
+            return None
+
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                path = str(Path(event.src_path).resolve())
+                if event.is_directory:
+                    watcher._queue_directory(path, watcher.UPSERT)
+                else:
+                    watcher._queue(path, watcher.UPSERT)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher._queue(str(Path(event.src_path).resolve()), watcher.UPSERT)
+
+            def on_deleted(self, event):
+                path = str(Path(event.src_path).resolve())
+                if event.is_directory:
+                    watcher._queue_directory(path, watcher.DELETE)
+                else:
+                    watcher._queue(path, watcher.DELETE)
+
+            def on_moved(self, event):
+                src_path = str(Path(event.src_path).resolve())
+                dest_path = str(Path(event.dest_path).resolve())
+                if event.is_directory:
+                    watcher._queue_directory(src_path, watcher.DELETE)
+                    if watcher.directory == Path(dest_path) or watcher.directory in Path(dest_path).parents:
+                        watcher._queue_directory(dest_path, watcher.UPSERT)
+                else:
+                    watcher._queue(src_path, watcher.DELETE)
+                    watcher._queue(dest_path, watcher.UPSERT)
+
+        observer = Observer()
+        observer.schedule(Handler(), str(self.directory), recursive=True)
+        observer.start()
+        return observer
+
+    def _take_batch(self) -> list[tuple[str, str]]:
+        """Take up to batch_size pending changes once events have settled."""
+        with self._lock:
+            if not self._pending:
+                return []
+            if time.monotonic() - self._last_event < self.debounce:
+                return []
+
+            batch = list(self._pending.items())[:self.batch_size]
+            for path, _ in batch:
+                del self._pending[path]
+            return batch
+
+    def _load(self, path: str) -> tuple[str, Optional[str], Optional[Iterator], Optional[str], Optional[Exception]]:
+        """Load a file, returning (path, text, records, file_type, error)."""
+        try:
+            # JSON records are streamed while indexing instead of loaded up front
+            if self.loader.is_structured(path):
+                records = self.loader.load_records(path)
+                first = next(records, None)
+                if first is None:
+                    return path, "", None, None, None
+                return path, "", itertools.chain([first], records), Path(path).suffix.lower().lstrip("."), None
+
+            text, file_type = self.loader.load(path)
+            return path, text, None, file_type, None
+        except Exception as e:
+            return path, None, None, None, e
+
+    def process_batch(self, batch: list[tuple[str, str]]) -> dict:
+        """
+        Apply a batch of file changes to the index.
+
+        Files are loaded concurrently (bounded by max_workers); indexing and
+        removal run sequentially since the local database has a single writer.
+
+        Args:
+            batch: List of (path, action) tuples
+
+        Returns:
+            Dictionary with counts of indexed, removed and failed files
+        """
+        counts = {"indexed": 0, "removed": 0, "failed": 0}
+
+        for path, action in batch:
+            if action == self.DELETE:
+                if self.manager.remove_document(self.manager.doc_id_for(path)):
+                    print(f"Removed: {path}")
+                    counts["removed"] += 1
+
+        upserts = [path for path, action in batch if action == self.UPSERT]
+        if not upserts:
+            return counts
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for path, text, records, file_type, error in executor.map(self._load, upserts):
+                if error is not None:
+                    print(f"Error loading {path}: {error}")
+                    counts["failed"] += 1
+                    continue
+
+                # A file emptied since it was indexed no longer has anything to search
+                if records is None and not text.strip():
+                    if self.manager.remove_document(self.manager.doc_id_for(path)):
+                        print(f"Removed: {path}")
+                        counts["removed"] += 1
+                    continue
+
+                try:
+                    self.manager.add_document(
+                        text=text,
+                        source_path=path,
+                        title=self.loader.get_title_from_file(path),
+                        file_type=file_type,
+                        records=records,
+                    )
+                except Exception as e:
+                    print(f"Error indexing {path}: {e}")
+                    counts["failed"] += 1
+                    continue
+
+                print(f"Indexed: {path}")
+                counts["indexed"] += 1
+
+        return counts
+
+    def run(self) -> None:
+        """Sync the directory, then watch it until interrupted."""
+        self.sync()
+
+        observer = self._start_observer()
+        mode = "polling" if observer is None else "watchdog"
+        print(f"Watching {self.directory} ({mode}, debounce {self.debounce}s)")
+
+        try:
+            while True:
+                if observer is None:
+                    self._poll()
+
+                batch = self._take_batch()
+                while batch:
+                    self.process_batch(batch)
+                    batch = self._take_batch()
+
+                time.sleep(self.poll_interval if observer is None else min(self.debounce, 1.0))
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
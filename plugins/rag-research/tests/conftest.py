@@ -0,0 +1,46 @@
+"""Shared fixtures: a RAG manager backed by a deterministic offline embedding model."""
+
+import hashlib
+import re
+
+import numpy as np
+import pytest
+
+import src.rag_manager as rag_manager
+from src.rag_manager import RAGManager
+
+DIM = 64
+
+
+class FakeEmbedding:
+    """Bag-of-words hashing embedding, so tests need no model download."""
+
+    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5", **kwargs):
+        self.model_name = model_name
+
+    def embed(self, texts, **kwargs):
+        for text in texts:
+            vector = np.zeros(DIM)
+            for word in re.findall(r"\w+", text.lower()):
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1
+            yield vector / (np.linalg.norm(vector) or 1)
+
+    @classmethod
+    def list_supported_models(cls):
+        return [
+            {"model": "BAAI/bge-small-en-v1.5", "dim": DIM},
+            {"model": "BAAI/bge-base-en-v1.5", "dim": DIM},
+        ]
+
+
+@pytest.fixture(autouse=True)
+def fake_embedding(monkeypatch):
+    monkeypatch.setattr(rag_manager, "TextEmbedding", FakeEmbedding)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = RAGManager(db_path=str(tmp_path / "db"), chunk_size=200, chunk_overlap=20)
+    yield manager
+    for client in manager.clients:
+        client.close()
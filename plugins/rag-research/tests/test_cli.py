@@ -0,0 +1,24 @@
+"""Tests for command-line argument validation."""
+
+import sys
+
+import pytest
+
+from src import cli
+
+
+@pytest.mark.parametrize("flags, error", [
+    (["--two-stage", "--docs", "3"], "--two-stage cannot be combined with --docs or --per-doc"),
+    (["--two-stage", "5", "--per-doc", "2"], "--two-stage cannot be combined with --docs or --per-doc"),
+    (["--mmr"], "--mmr requires --docs or --per-doc"),
+    (["--mmr", "0.3", "--two-stage"], "--mmr requires --docs or --per-doc"),
+])
+def test_research_rejects_conflicting_flags(tmp_path, monkeypatch, capsys, flags, error):
+    monkeypatch.setattr(sys, "argv", ["rag-research", "-p", str(tmp_path), "research", "tomatoes", *flags])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 1
+    assert f"Error: {error}" in capsys.readouterr().out
+    assert not (tmp_path / ".rag-research").exists()
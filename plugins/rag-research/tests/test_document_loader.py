@@ -0,0 +1,159 @@
+"""Tests for the streaming JSON/JSONL record loader."""
+
+import io
+import json
+import random
+import tarfile
+import zipfile
+
+import pytest
+
+from src.document_loader import DocumentLoader
+
+
+def make_loader(block_size: int) -> DocumentLoader:
+    loader = DocumentLoader(use_mistral_ocr=False)
+    loader.STREAM_BLOCK_SIZE = block_size
+    return loader
+
+
+def records(loader: DocumentLoader, text: str, ext: str = ".json") -> list[tuple[str, str]]:
+    return list(loader._iter_records(io.BytesIO(text.encode()), ext))
+
+
+def reference_records(loader: DocumentLoader, text: str) -> list[tuple[str, str]]:
+    """Records built from json.loads with the same record boundaries."""
+    document = json.loads(text)
+    values = []
+
+    if isinstance(document, list):
+        values = [(f"/{i}", item) for i, item in enumerate(document)]
+    elif isinstance(document, dict):
+        for key, value in document.items():
+            pointer = "/" + key.replace("~", "~0").replace("/", "~1")
+            if isinstance(value, list):
+                values.extend(
+                    (f"{pointer}/{i}", item if isinstance(item, (dict, list)) else {key: item})
+                    for i, item in enumerate(value)
+                )
+            else:
+                values.append((pointer, {key: value}))
+    else:
+        values = [("", document)]
+
+    flattened = [(pointer, "\n".join(loader._flatten(value))) for pointer, value in values]
+    return [(pointer, text) for pointer, text in flattened if text.strip()]
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return rng.randint(-10**12, 10**12)
+    if kind == 1:
+        return rng.choice([12.75, -0.5, 1e-7, 3.25e10, rng.uniform(-1000, 1000)])
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind in (3, 4):
+        return "".join(rng.choice("ab c/~\\\"é\n") for _ in range(rng.randrange(12)))
+    if kind == 5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randrange(5))}
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7])
+def test_records_match_json_loads_at_small_block_sizes(block_size):
+    rng = random.Random(block_size)
+    loader = make_loader(block_size)
+
+    for _ in range(300):
+        text = json.dumps(random_value(rng), indent=rng.choice([None, 1]))
+        assert records(loader, text) == reference_records(loader, text), text
+
+
+def test_number_split_at_block_boundary():
+    loader = DocumentLoader(use_mistral_ocr=False)
+    prefix = '{"pad":"'
+    # Place "12." so that it ends exactly at the end of the first block
+    pad = "x" * (loader.STREAM_BLOCK_SIZE - len(prefix) - len('","price": 12.'))
+    text = f'{prefix}{pad}","price": 12.75}}'
+
+    assert records(loader, text)[-1] == ("/price", "price: 12.75")
+
+
+@pytest.mark.parametrize("text", ["[1,2] junk", '{"a":1}{"b":2}', '"a" "b"', "[1,2", '{"a" 1}', "[1 2]"])
+def test_invalid_json_is_rejected(text):
+    with pytest.raises(ValueError):
+        records(make_loader(4), text)
+
+
+def test_root_object_streams_arrays_and_keeps_keys():
+    text = json.dumps({"name": "Widget", "tags": ["a", "b"], "users": [{"id": 1, "x": None}], "a/b": {"c": []}})
+
+    assert records(make_loader(3), text) == [
+        ("/name", "name: Widget"),
+        ("/tags/0", "tags: a"),
+        ("/tags/1", "tags: b"),
+        ("/users/0", "id: 1"),
+    ]
+
+
+def test_jsonl_records_use_line_index():
+    text = '{"a": 1}\n\n{"b": [1, 2], "c": {"d": true}}\n'
+
+    assert records(make_loader(2), text, ".jsonl") == [("/0", "a: 1"), ("/2", "b: 1, 2\nc.d: true")]
+
+
+def test_load_bytes_joins_flattened_records():
+    loader = DocumentLoader(use_mistral_ocr=False)
+
+    text, file_type = loader.load_bytes(b'[{"a": 1}, {"b": "x"}]', "data.json")
+
+    assert (text, file_type) == ("a: 1\n\nb: x", "json")
+
+
+def test_iter_archive_only_reads_loaded_members(tmp_path, monkeypatch):
+    archive_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("done.md", "Already journaled.")
+        archive.writestr("data.jsonl", '{"a": 1}\n')
+        archive.writestr("notes.md", "Notes about embeddings.")
+
+    opened = []
+    open_member = zipfile.ZipFile.open
+
+    def recording_open(self, name, *args, **kwargs):
+        opened.append(getattr(name, "filename", name))
+        return open_member(self, name, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", recording_open)
+    loader = DocumentLoader(use_mistral_ocr=False)
+    skip = {f"{archive_path}!/done.md"}
+
+    members = list(loader.iter_archive(str(archive_path), skip=skip, defer_structured=True))
+
+    assert [(path.split("!/")[1], text) for path, text, _, _ in members] == [
+        ("data.jsonl", None),
+        ("notes.md", "Notes about embeddings."),
+    ]
+    assert opened == ["notes.md"]
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar.gz"])
+def test_load_records_streams_archive_members(tmp_path, suffix):
+    data = "\n".join(json.dumps({"id": i, "name": f"item {i}"}) for i in range(50)).encode()
+    source = tmp_path / "data.jsonl"
+    source.write_bytes(data)
+
+    archive_path = tmp_path / f"bundle{suffix}"
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("export/data.jsonl", data)
+    else:
+        with tarfile.open(archive_path, "w:gz") as archive:
+            archive.add(source, arcname="export/data.jsonl")
+
+    loader = make_loader(16)
+    member_records = list(loader.load_records(f"{archive_path}!/export/data.jsonl"))
+
+    assert member_records == list(loader.load_records(str(source)))
+    assert len(member_records) == 50
@@ -0,0 +1,23 @@
+"""Tests for searching several databases as one."""
+
+from src.federation import federated_search
+from src.rag_manager import RAGManager
+
+
+def test_federated_search_merges_and_tags_stores(tmp_path):
+    managers = {
+        "papers": RAGManager(db_path=str(tmp_path / "papers"), chunk_size=200, chunk_overlap=20),
+        "notes": RAGManager(db_path=str(tmp_path / "notes"), chunk_size=200, chunk_overlap=20),
+    }
+    try:
+        managers["papers"].add_document("Dense retrieval with vector search. " * 10, "/papers/a.md", "a")
+        managers["notes"].add_document("Tomato gardening notes. " * 10, "/notes/b.md", "b")
+
+        results = federated_search(managers, "tomato gardening", limit=5)
+
+        assert results[0].store == "notes"
+        assert {r.store for r in results} == {"papers", "notes"}
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+    finally:
+        for manager in managers.values():
+            manager.client.close()
@@ -0,0 +1,141 @@
+"""Tests for checkpointed ingestion jobs."""
+
+import zipfile
+
+import pytest
+
+from src.jobs import IngestJob
+
+
+def write_docs(tmp_path, count: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"Document {i} talks about topic{i}. " * 20)
+        paths.append(str(path))
+    return paths
+
+
+def count_points(manager) -> int:
+    return sum(client.count(manager.COLLECTION_NAME).count for client in manager.clients)
+
+
+def test_discard_deletes_uncommitted_points(manager, tmp_path, monkeypatch):
+    job = IngestJob.create(manager, write_docs(tmp_path, 2))
+
+    def fail_commit(**kwargs):
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(manager, "commit_document", fail_commit)
+    job.run()
+    assert [entry["state"] for entry in job.journal["files"]] == [IngestJob.UPSERTED] * 2
+    assert count_points(manager) > 0
+
+    job.discard()
+
+    assert count_points(manager) == 0
+    assert manager.search("topic0") == []
+    assert IngestJob.list_jobs(manager) == []
+
+
+def test_empty_files_are_skipped_and_job_completes(manager, tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("   \n")
+    archive = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("blank.txt", "")
+        zf.writestr("empty.json", "[]")
+        zf.writestr("notes.md", "Archived notes about embeddings.")
+
+    job = IngestJob.create(manager, [str(empty), str(archive)])
+    counts = job.run()
+
+    assert counts[IngestJob.SKIPPED] == 3
+    assert counts[IngestJob.COMMITTED] == 1
+    assert counts["failed"] == 0
+    assert not job.job_dir.exists()
+    assert IngestJob.list_jobs(manager) == []
+
+
+def assert_committed(manager, job, paths):
+    assert IngestJob.list_jobs(manager) == []
+    assert not job.job_dir.exists()
+    assert len(manager.list_documents()) == len(paths)
+    for i in range(len(paths)):
+        assert manager.search(f"topic{i}", limit=1)[0].source_path == paths[i]
+
+
+def test_job_resumes_after_a_failed_embedding_batch(manager, tmp_path, monkeypatch):
+    paths = write_docs(tmp_path, 3)
+    job = IngestJob.create(manager, paths)
+    embed = manager.embed
+
+    def fail_once(texts):
+        monkeypatch.setattr(manager, "embed", embed)
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(manager, "embed", fail_once)
+    counts = job.run()
+
+    assert counts["failed"] == 3
+    assert [entry["state"] for entry in job.journal["files"]] == [IngestJob.CHUNKED] * 3
+    assert not list(job.job_dir.rglob("*.tmp"))
+    assert count_points(manager) == 0
+
+    counts = IngestJob(manager, job.job_id).run()
+
+    assert counts[IngestJob.COMMITTED] == 3
+    assert_committed(manager, job, paths)
+
+
+def test_job_resumes_after_being_interrupted(manager, tmp_path, monkeypatch):
+    paths = write_docs(tmp_path, 3)
+    job = IngestJob.create(manager, paths)
+    upsert_chunks = manager.upsert_chunks
+
+    def interrupt(**kwargs):
+        # Write part of the file's points, then stop the process
+        upsert_chunks(**{**kwargs, "chunks": list(kwargs["chunks"])[:1],
+                         "embeddings": list(kwargs["embeddings"])[:1]})
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(manager, "upsert_chunks", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        job.run()
+    monkeypatch.setattr(manager, "upsert_chunks", upsert_chunks)
+
+    resumed = IngestJob(manager, job.job_id)
+    assert [entry["state"] for entry in resumed.journal["files"]] == [IngestJob.EMBEDDED] * 3
+
+    counts = resumed.run()
+
+    assert counts[IngestJob.COMMITTED] == 3
+    assert_committed(manager, job, paths)
+    assert count_points(manager) == sum(doc["total_chunks"] for doc in manager.list_documents())
+
+
+def test_journal_log_is_folded_into_journal_on_open(manager, tmp_path, monkeypatch):
+    job = IngestJob.create(manager, write_docs(tmp_path, 2) * 2)
+    assert len(job.journal["files"]) == 2
+
+    save_metadata = manager.save_metadata
+
+    def fail_save():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(manager, "save_metadata", fail_save)
+    with pytest.raises(RuntimeError):
+        job.run()
+    monkeypatch.setattr(manager, "save_metadata", save_metadata)
+
+    # Checkpoints are appended, and a torn final line from a crash is ignored
+    with open(job.log_path, "a") as f:
+        f.write('{"entry": {"doc_id"')
+
+    resumed = IngestJob(manager, job.job_id)
+    assert not resumed.log_path.exists()
+    assert [entry["state"] for entry in resumed.journal["files"]] == [IngestJob.UPSERTED] * 2
+    assert IngestJob(manager, job.job_id).journal == resumed.journal
+
+    assert resumed.run()[IngestJob.COMMITTED] == 2
+    assert manager.get_stats()["total_documents"] == 2
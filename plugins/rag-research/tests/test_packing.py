@@ -0,0 +1,34 @@
+"""Tests for packing search results into a token budget."""
+
+from src.packing import pack_results
+from src.rag_manager import SearchResult
+
+
+def hit(doc_id: str, chunk_index: int, score: float, text: str) -> SearchResult:
+    return SearchResult(
+        doc_id=doc_id,
+        title=doc_id,
+        source_path=f"/docs/{doc_id}.md",
+        chunk_text=text,
+        chunk_index=chunk_index,
+        score=score,
+    )
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def test_adjacent_chunks_merge_and_budget_is_respected(manager):
+    results = [
+        hit("a", 0, 0.9, "alpha beta gamma delta"),
+        hit("a", 1, 0.5, "gamma delta epsilon"),
+        hit("b", 4, 0.8, "one two three four five six seven eight"),
+        hit("c", 2, 0.7, "short text"),
+    ]
+
+    packed = pack_results(results, max_tokens=8, count_tokens=count_words, join_chunks=manager.join_chunks)
+
+    assert [(p["doc_id"], p["chunks"]) for p in packed] == [("a", [0, 1]), ("c", [2, 2])]
+    assert packed[0]["score"] == 0.9
+    assert sum(p["tokens"] for p in packed) <= 8
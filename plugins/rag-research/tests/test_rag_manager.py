@@ -0,0 +1,367 @@
+"""Tests for RAGManager chunking, sharding and database setup."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client.models import DeleteAlias, DeleteAliasOperation
+
+from src.rag_manager import RAGManager, SearchResult
+
+from .conftest import DIM, FakeEmbedding
+
+
+def test_shard_count_below_one_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        RAGManager(db_path=str(tmp_path / "db"), shards=0)
+
+
+def test_existing_database_without_shard_count_stays_on_one_shard(tmp_path):
+    db_path = tmp_path / "db"
+    manager = RAGManager(db_path=str(db_path))
+    manager.client.close()
+
+    # Metadata written before sharding has no shard count
+    metadata_path = db_path / RAGManager.METADATA_FILE
+    metadata = json.loads(metadata_path.read_text())
+    del metadata["shards"]
+    metadata_path.write_text(json.dumps(metadata))
+
+    manager = RAGManager(db_path=str(db_path), shards=4)
+    try:
+        assert manager.shards == 1
+        assert len(manager.clients) == 1
+    finally:
+        manager.client.close()
+
+
+def test_new_database_is_sharded(tmp_path):
+    manager = RAGManager(db_path=str(tmp_path / "db"), shards=3)
+    try:
+        assert manager.shards == 3
+        assert all(client.collection_exists(RAGManager.COLLECTION_NAME) for client in manager.clients)
+    finally:
+        for client in manager.clients:
+            client.close()
+
+
+def test_legacy_database_refuses_model_of_another_size(tmp_path, monkeypatch):
+    db_path = tmp_path / "db"
+    manager = RAGManager(db_path=str(db_path), embedding_model="BAAI/bge-small-en-v1.5")
+    manager.client.close()
+
+    # Metadata written before the model was recorded
+    metadata_path = db_path / RAGManager.METADATA_FILE
+    metadata = json.loads(metadata_path.read_text())
+    del metadata["embedding_model"]
+    metadata_path.write_text(json.dumps(metadata))
+
+    monkeypatch.setattr(
+        FakeEmbedding,
+        "list_supported_models",
+        classmethod(lambda cls: [
+            {"model": "BAAI/bge-small-en-v1.5", "dim": DIM},
+            {"model": "BAAI/bge-base-en-v1.5", "dim": DIM * 2},
+        ]),
+    )
+
+    with pytest.raises(ValueError, match="dimensional vectors"):
+        RAGManager(db_path=str(db_path), embedding_model="BAAI/bge-base-en-v1.5")
+
+    manager = RAGManager(db_path=str(db_path), embedding_model="BAAI/bge-small-en-v1.5")
+    try:
+        assert manager.embedding_model_name == "BAAI/bge-small-en-v1.5"
+    finally:
+        manager.client.close()
+
+
+def test_document_vectors_are_built_on_first_two_stage_search(tmp_path):
+    db_path = tmp_path / "db"
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    manager.add_document("Vector search over embeddings. " * 20, "/docs/a.md", "a")
+    manager.add_document("Gardening tips for tomatoes. " * 20, "/docs/b.md", "b")
+    expected = manager.search_two_stage("tomatoes", limit=1, top_docs=1)
+
+    # Simulate a database indexed before document vectors existed
+    manager._delete_collection(manager._document_collection())
+    manager.client.close()
+
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    try:
+        assert not manager.has_document_vectors
+
+        manager.add_document("More about tomatoes. " * 20, "/docs/c.md", "c")
+        manager.remove_document(manager.doc_id_for("/docs/c.md"))
+
+        progress = []
+        manager.build_document_vectors(lambda scanned, total: progress.append((scanned, total)))
+        assert manager.has_document_vectors
+        assert progress[-1][0] == progress[-1][1] == manager.get_stats()["total_chunks"]
+
+        results = manager.search_two_stage("tomatoes", limit=1, top_docs=1)
+        assert [(r.doc_id, r.chunk_index) for r in results] == [(r.doc_id, r.chunk_index) for r in expected]
+    finally:
+        manager.client.close()
+
+
+def test_chunk_records_packs_records_and_splits_long_ones(manager):
+    def records():
+        yield "/0", "a" * 90
+        yield "/1", "b" * 90
+        yield "/2", "c" * 90
+        yield "/3", "long " * 100
+        yield "/4", "d" * 10
+
+    chunks = list(manager.chunk(records=records()))
+
+    # Two records fit in a 200 character chunk, a third starts a new one
+    assert chunks[0] == ("a" * 90 + "\n\n" + "b" * 90, "/0")
+    assert chunks[1] == ("c" * 90, "/2")
+
+    # The long record is split on its own and every piece points at it
+    long_chunks = [chunk for chunk, pointer in chunks if pointer == "/3"]
+    assert len(long_chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in long_chunks)
+    assert chunks[-1] == ("d" * 10, "/4")
+
+
+def test_chunk_records_consumes_records_lazily(manager):
+    consumed = []
+
+    def records():
+        for i in range(100):
+            consumed.append(i)
+            yield f"/{i}", "x" * 90
+
+    chunks = manager.chunk(records=records())
+    assert next(chunks) == ("x" * 90 + "\n\n" + "x" * 90, "/0")
+    assert len(consumed) == 3
+
+
+def test_failed_rewrite_leaves_no_partial_document(manager, monkeypatch):
+    doc_id = manager.add_document("Old notes about tomatoes. " * 20, "/docs/a.md", "a")
+    embed_texts = manager._embed_texts
+    calls = []
+
+    def fail_second_batch(texts, *args):
+        calls.append(texts)
+        if len(calls) > 1:
+            raise RuntimeError("model unavailable")
+        return embed_texts(texts, *args)
+
+    monkeypatch.setattr(manager, "_embed_texts", fail_second_batch)
+    records = ((f"/{i}", f"record {i} about peppers") for i in range(2000))
+    with pytest.raises(RuntimeError):
+        manager.add_document("", "/docs/a.md", "a", records=records)
+
+    assert doc_id not in {doc["doc_id"] for doc in manager.list_documents()}
+    assert sum(client.count(manager.COLLECTION_NAME).count for client in manager.clients) == 0
+
+
+@pytest.mark.parametrize("doc_id", ["typo", "", "0123456789abcdef", "ABCDEF012345"])
+def test_remove_unknown_document_id(manager, doc_id):
+    manager.add_document("Notes about tomatoes. " * 20, "/docs/a.md", "a")
+
+    assert manager.remove_document(doc_id) is False
+    assert manager.get_stats()["total_documents"] == 1
+
+
+SMALL_MODEL = "BAAI/bge-small-en-v1.5"
+BASE_MODEL = "BAAI/bge-base-en-v1.5"
+
+
+def add_notes(manager) -> None:
+    manager.add_document("Vector search over embeddings. " * 20, "/docs/a.md", "a")
+    manager.add_document("Gardening tips for tomatoes. " * 20, "/docs/b.md", "b")
+
+
+def interrupt_after_first_batch(migrated, total):
+    raise KeyboardInterrupt
+
+
+def make_legacy(db_path) -> None:
+    """Turn a database into one with a plain collection and no recorded model."""
+    manager = RAGManager(db_path=str(db_path))
+    collection = manager._resolve_collection()
+    points, _ = manager.client.scroll(collection, limit=10_000, with_payload=True, with_vectors=True)
+
+    manager._update_aliases([DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=RAGManager.COLLECTION_NAME))])
+    manager._delete_collection(collection)
+    manager._delete_collection(manager._document_collection(collection))
+    manager._create_collection(RAGManager.COLLECTION_NAME, SMALL_MODEL)
+    manager.client.upsert(RAGManager.COLLECTION_NAME, points=points)
+    manager.client.close()
+
+    metadata_path = db_path / RAGManager.METADATA_FILE
+    metadata = json.loads(metadata_path.read_text())
+    del metadata["embedding_model"]
+    metadata_path.write_text(json.dumps(metadata))
+
+
+def test_migrate_switches_model_and_keeps_results(manager):
+    add_notes(manager)
+    expected = [(r.doc_id, r.chunk_index) for r in manager.search("tomatoes", limit=3)]
+    old_collection = manager._resolve_collection()
+
+    manager.migrate(BASE_MODEL, batch_size=2)
+
+    assert manager.embedding_model_name == BASE_MODEL
+    assert manager._resolve_collection() == manager._collection_for_model(BASE_MODEL)
+    assert not manager.client.collection_exists(old_collection)
+    assert not manager.migration_path.exists()
+    assert [(r.doc_id, r.chunk_index) for r in manager.search("tomatoes", limit=3)] == expected
+    assert manager.search_two_stage("tomatoes", limit=1, top_docs=1)[0].title == "b"
+
+
+def test_writes_during_migration_reach_both_collections(tmp_path):
+    db_path = tmp_path / "db"
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    add_notes(manager)
+    with pytest.raises(KeyboardInterrupt):
+        manager.migrate(BASE_MODEL, batch_size=1, progress_callback=interrupt_after_first_batch)
+    manager.client.close()
+
+    # Research keeps serving from the old model while the migration is paused
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    try:
+        assert manager.embedding_model_name == SMALL_MODEL
+        manager.add_document("Notes about peppers. " * 20, "/docs/c.md", "c")
+        manager.remove_document(manager.doc_id_for("/docs/a.md"))
+        assert manager.search("peppers", limit=1)[0].title == "c"
+
+        manager.migrate(BASE_MODEL)
+
+        assert manager.embedding_model_name == BASE_MODEL
+        assert manager.search("peppers", limit=1)[0].title == "c"
+        assert {r.title for r in manager.search("embeddings vector search", limit=10)} == {"b", "c"}
+        chunks = manager.client.count(RAGManager.COLLECTION_NAME).count
+        assert chunks == manager.get_stats()["total_chunks"]
+    finally:
+        manager.client.close()
+
+
+def test_cancel_migration_drops_partial_collection(manager):
+    add_notes(manager)
+    with pytest.raises(KeyboardInterrupt):
+        manager.migrate(BASE_MODEL, batch_size=1, progress_callback=interrupt_after_first_batch)
+    target = manager._collection_for_model(BASE_MODEL)
+    assert manager.client.collection_exists(target)
+
+    assert manager.cancel_migration()
+
+    assert not manager.client.collection_exists(target)
+    assert not manager.migration_path.exists()
+    assert manager.embedding_model_name == SMALL_MODEL
+    assert manager.search("tomatoes", limit=1)[0].title == "b"
+    assert not manager.cancel_migration()
+
+
+def test_interrupted_legacy_switch_is_finished_on_open(tmp_path, monkeypatch):
+    db_path = tmp_path / "db"
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    add_notes(manager)
+    manager.client.close()
+    make_legacy(db_path)
+
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    assert manager._resolve_collection() == RAGManager.COLLECTION_NAME
+
+    # Stop after the plain collection is deleted, before the alias exists
+    def interrupt(operations):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(manager, "_update_aliases", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        manager.migrate(BASE_MODEL)
+    assert not manager.client.collection_exists(RAGManager.COLLECTION_NAME)
+    manager.client.close()
+
+    manager = RAGManager(db_path=str(db_path), chunk_size=200, chunk_overlap=20)
+    try:
+        assert manager.embedding_model_name == BASE_MODEL
+        assert manager._resolve_collection() == manager._collection_for_model(BASE_MODEL)
+        assert not manager.migration_path.exists()
+        assert manager.search("tomatoes", limit=1)[0].title == "b"
+    finally:
+        manager.client.close()
+
+
+def test_search_groups_limits_documents_and_chunks(manager):
+    manager.add_document("Tomatoes need sun and water. " * 40, "/docs/long.md", "long")
+    manager.add_document("Tomatoes grow in pots. " * 10, "/docs/short.md", "short")
+    manager.add_document("Notes about databases and indexes. " * 10, "/docs/other.md", "other")
+
+    groups = manager.search_groups("tomatoes", docs=2, per_doc=2)
+
+    assert {group.title for group in groups} == {"long", "short"}
+    assert all(1 <= len(group.hits) <= 2 for group in groups)
+    assert all(hit.doc_id == group.doc_id for group in groups for hit in group.hits)
+    assert [group.score for group in groups] == sorted((group.score for group in groups), reverse=True)
+
+
+def test_mmr_prefers_diverse_chunks():
+    points = [
+        SimpleNamespace(id=0, score=0.9, vector=[1.0, 0.0, 0.0]),
+        SimpleNamespace(id=1, score=0.89, vector=[1.0, 0.01, 0.0]),
+        SimpleNamespace(id=2, score=0.6, vector=[0.0, 1.0, 0.0]),
+        SimpleNamespace(id=3, score=0.5, vector=[0.0, 0.0, 0.0]),
+    ]
+    manager = RAGManager.__new__(RAGManager)
+
+    assert [p.id for p in manager._select_mmr(points, 2, 1.0)] == [0, 1]
+    assert [p.id for p in manager._select_mmr(points, 2, 0.5)] == [0, 2]
+    assert [p.id for p in manager._select_mmr(points, 10, 0.5)] == [0, 2, 3, 1]
+    assert manager._select_mmr([], 3, 0.5) == []
+
+
+def test_search_groups_with_mmr_returns_distinct_chunks(manager):
+    manager.add_document(
+        "Tomatoes need sun. " * 15 + "Watering schedules for tomatoes in summer. " * 10,
+        "/docs/a.md",
+        "a",
+    )
+
+    plain = manager.search_groups("tomatoes sun", docs=1, per_doc=2)
+    diverse = manager.search_groups("tomatoes sun", docs=1, per_doc=2, mmr=0.3)
+
+    assert len(diverse[0].hits) == 2
+    assert len({hit.chunk_index for hit in diverse[0].hits}) == 2
+    assert diverse[0].hits[0].chunk_index == plain[0].hits[0].chunk_index
+
+
+def test_expand_context_merges_windows_and_joins_without_overlap(tmp_path):
+    manager = RAGManager(db_path=str(tmp_path / "db"), chunk_size=200, chunk_overlap=20, shards=2)
+    try:
+        # Unique words make every chunk locatable in the source text; the two
+        # documents live on different shards
+        text = " ".join(f"w{i:04d}" for i in range(400)) + "."
+        shards = {manager.shard_index(manager.doc_id_for(f"/docs/{i}.md")): f"/docs/{i}.md" for i in range(20)}
+        path_a, path_b = shards[0], shards[1]
+        doc_a = manager.add_document(text, path_a, "a")
+        doc_b = manager.add_document(text, path_b, "b")
+
+        chunks = manager._chunk_text(text)
+        assert len(chunks) > 12
+
+        def hit(doc_id, chunk_index, score):
+            return SearchResult(
+                doc_id=doc_id, title="", source_path="", chunk_text="", chunk_index=chunk_index, score=score
+            )
+
+        last = len(chunks) - 1
+        results = [hit(doc_a, 2, 0.5), hit(doc_a, 4, 0.9), hit(doc_a, last, 0.4), hit(doc_b, 0, 0.7)]
+
+        passages = manager.expand_context(results, window=1)
+
+        assert [(p.doc_id, p.start_chunk, p.end_chunk, p.score) for p in passages] == [
+            (doc_a, 1, 5, 0.9),
+            (doc_b, 0, 1, 0.7),
+            (doc_a, last - 1, last, 0.4),
+        ]
+        for passage in passages:
+            first, final = chunks[passage.start_chunk], chunks[passage.end_chunk]
+            expected = text[text.index(first):text.index(final) + len(final)]
+            assert passage.text == expected
+    finally:
+        for client in manager.clients:
+            client.close()
@@ -0,0 +1,85 @@
+"""Tests for reconciling a watched directory with the index."""
+
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.document_loader import DocumentLoader
+from src.jobs import IngestJob
+from src.watcher import DirectoryWatcher
+
+
+def test_sync_keeps_archive_members(manager, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "notes.md").write_text("Notes about vector search.")
+    with zipfile.ZipFile(docs / "bundle.zip", "w") as archive:
+        archive.writestr("inner/one.md", "Archived notes about embeddings.")
+
+    IngestJob.create(manager, [str(docs / "notes.md"), str(docs / "bundle.zip")]).run()
+    assert manager.get_stats()["total_documents"] == 2
+
+    watcher = DirectoryWatcher(manager, DocumentLoader(use_mistral_ocr=False), str(docs), debounce=0)
+    watcher.sync()
+
+    assert watcher._pending == {}
+
+
+def test_malformed_rewrite_keeps_previous_version(manager, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    data = docs / "data.json"
+    data.write_text(json.dumps([{"name": f"record {i}", "topic": "tomatoes " * 10} for i in range(600)]))
+
+    watcher = DirectoryWatcher(manager, DocumentLoader(use_mistral_ocr=False), str(docs), debounce=0)
+    assert watcher.process_batch([(str(data), watcher.UPSERT)])["indexed"] == 1
+    before = manager.list_documents()
+    hits = manager.search("tomatoes", limit=100)
+
+    valid = json.dumps([{"name": f"new {i}", "topic": "peppers " * 10} for i in range(600)])
+    data.write_text(valid[:-1] + ", {")
+
+    assert watcher.process_batch([(str(data), watcher.UPSERT)])["failed"] == 1
+    assert manager.list_documents() == before
+    assert not any("new" in hit.chunk_text for hit in manager.search("peppers", limit=100))
+    assert [hit.chunk_text for hit in manager.search("tomatoes", limit=100)] == [hit.chunk_text for hit in hits]
+
+
+@pytest.mark.parametrize("name, empty", [("note.md", ""), ("data.json", "[]")])
+def test_emptied_file_is_removed(manager, tmp_path, name, empty):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    path = docs / name
+    path.write_text(json.dumps([{"topic": "tomatoes"}]) if name.endswith(".json") else "Notes about tomatoes.")
+
+    watcher = DirectoryWatcher(manager, DocumentLoader(use_mistral_ocr=False), str(docs), debounce=0)
+    assert watcher.process_batch([(str(path), watcher.UPSERT)])["indexed"] == 1
+
+    path.write_text(empty)
+
+    assert watcher.process_batch([(str(path), watcher.UPSERT)])["removed"] == 1
+    assert manager.list_documents() == []
+    assert manager.search("tomatoes") == []
+
+
+def test_removed_directory_queues_its_documents(manager, tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "sub" / "deep").mkdir(parents=True)
+    (docs / "sub" / "a.md").write_text("Notes about tomatoes.")
+    (docs / "sub" / "deep" / "b.md").write_text("Notes about peppers.")
+    (docs / "subway.md").write_text("Notes about trains.")
+
+    loader = DocumentLoader(use_mistral_ocr=False)
+    watcher = DirectoryWatcher(manager, loader, str(docs), debounce=0)
+    watcher.sync()
+    assert watcher.process_batch(watcher._take_batch())["indexed"] == 3
+
+    moved = tmp_path / "elsewhere"
+    (docs / "sub").rename(moved)
+    watcher._queue_directory(str((docs / "sub").resolve()), watcher.DELETE)
+
+    assert sorted(watcher._pending) == [str(docs / "sub" / "a.md"), str(docs / "sub" / "deep" / "b.md")]
+    assert watcher.process_batch(watcher._take_batch())["removed"] == 2
+    assert [Path(doc["source_path"]).name for doc in manager.list_documents()] == ["subway.md"]